@@ -1,3 +1,3 @@
-from .models import db, User, Project, Cohort, ProjectMember, ActivityLog
+from .models import db, User, Project, Cohort, ProjectMember, ActivityLog, EmailMessage, TwoFactorCode, ResourceVersion, ProjectStat, TaskStat
 
-__all__ = ["db", "User", "Project", "Cohort", "ProjectMember", "ActivityLog"]
+__all__ = ["db", "User", "Project", "Cohort", "ProjectMember", "ActivityLog", "EmailMessage", "TwoFactorCode", "ResourceVersion", "ProjectStat", "TaskStat"]
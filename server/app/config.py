@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from app.utils.pool_metrics import InstrumentedQueuePool
 
 # Load variables from .env file
 load_dotenv()
@@ -23,6 +24,88 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool (per gunicorn worker). pre_ping + recycle drop connections
+    # the server closed, e.g. after a Postgres restart.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+    if SQLALCHEMY_DATABASE_URI not in ('sqlite://', 'sqlite:///:memory:'):
+        # In-memory SQLite must keep its single shared connection
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
+            'pool_timeout': DB_POOL_TIMEOUT,
+        })
+
+    # Password hashing (Werkzeug method string; outdated hashes are upgraded on login)
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 4))
+    PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT', 32))
+
+    # Bulk user import (processes used to hash passwords; 1 = inline)
+    USER_IMPORT_PROCESSES = int(os.environ.get('USER_IMPORT_PROCESSES', os.cpu_count() or 1))
+    USER_IMPORT_MAX_ROWS = int(os.environ.get('USER_IMPORT_MAX_ROWS', 5000))
+
+    # Rows fetched per server-side cursor batch when streaming GET /tasks/
+    TASK_STREAM_BATCH_SIZE = int(os.environ.get('TASK_STREAM_BATCH_SIZE', 500))
+
+    # Activity log writer (batched background INSERTs)
+    ACTIVITY_LOG_ASYNC = os.environ.get('ACTIVITY_LOG_ASYNC', 'true').lower() == 'true'
+    ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 100))
+    ACTIVITY_LOG_FLUSH_INTERVAL_MS = int(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL_MS', 500))
+    ACTIVITY_LOG_QUEUE_SIZE = int(os.environ.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+
+    # Authenticated user cache (memory = per process, redis = shared by all workers)
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND', 'memory')
+    USER_CACHE_REDIS_URL = os.environ.get('USER_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    USER_CACHE_TTL_SECONDS = int(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+    USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', 10000))
+
+    # Verified JWT cache (skips HS256 verification for repeat tokens until exp)
+    JWT_CACHE_ENABLED = os.environ.get('JWT_CACHE_ENABLED', 'true').lower() == 'true'
+    JWT_CACHE_MAX_SIZE = int(os.environ.get('JWT_CACHE_MAX_SIZE', 10000))
+
+    # 2FA login codes (database = shared by all workers, memory = tests only)
+    TWO_FA_STORE = os.environ.get('TWO_FA_STORE', 'database')
+    TWO_FA_CODE_TTL_MINUTES = int(os.environ.get('TWO_FA_CODE_TTL_MINUTES', 10))
+    TWO_FA_MAX_ATTEMPTS = int(os.environ.get('TWO_FA_MAX_ATTEMPTS', 5))
+    TWO_FA_SWEEP_INTERVAL_SECONDS = int(os.environ.get('TWO_FA_SWEEP_INTERVAL_SECONDS', 300))
+
+    # Per-request query instrumentation
+    QUERY_STATS_ENABLED = os.environ.get('QUERY_STATS_ENABLED', 'true').lower() == 'true'
+    SLOW_REQUEST_QUERY_COUNT = int(os.environ.get('SLOW_REQUEST_QUERY_COUNT', 20))
+    SLOW_REQUEST_DB_MS = int(os.environ.get('SLOW_REQUEST_DB_MS', 200))
+    QUERY_STATS_TOP_N = int(os.environ.get('QUERY_STATS_TOP_N', 3))
+    QUERY_STATS_HEADERS = os.environ.get('QUERY_STATS_HEADERS', 'debug').lower()  # true, false, debug
+
+    # Response cache for reference data (classes, cohorts); per worker, TTL + LRU bounded
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get('RESPONSE_CACHE_TTL_SECONDS', 300))
+    RESPONSE_CACHE_MAX_SIZE = int(os.environ.get('RESPONSE_CACHE_MAX_SIZE', 1024))
+
+    # Broadcast cache invalidations to the other workers (PostgreSQL only)
+    INVALIDATION_BUS_ENABLED = os.environ.get('INVALIDATION_BUS_ENABLED', 'true').lower() == 'true'
+    INVALIDATION_CHANNEL = os.environ.get('INVALIDATION_CHANNEL', 'cache_invalidation')
+    INVALIDATION_PING_SECONDS = int(os.environ.get('INVALIDATION_PING_SECONDS', 30))
+
+    # Bearer token required by GET /metrics when set
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Response compression (br needs the optional brotli package)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI = os.environ.get('COMPRESS_BROTLI', 'true').lower() == 'true'
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 4))
+
     # Cloudinary
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
@@ -30,3 +113,16 @@ class Config:
 
     # SendGrid
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
+
+    # Outbound email queue
+    EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT', 'sendgrid')  # sendgrid, smtp, memory
+    EMAIL_SMTP_HOST = os.environ.get('EMAIL_SMTP_HOST', 'localhost')
+    EMAIL_SMTP_PORT = int(os.environ.get('EMAIL_SMTP_PORT', 1025))
+    EMAIL_QUEUE_SYNC = os.environ.get('EMAIL_QUEUE_SYNC', 'false').lower() == 'true'
+    EMAIL_WORKERS = int(os.environ.get('EMAIL_WORKERS', 2))
+    EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', 5))
+    EMAIL_RETRY_BASE_SECONDS = int(os.environ.get('EMAIL_RETRY_BASE_SECONDS', 30))
+    EMAIL_POLL_INTERVAL_SECONDS = int(os.environ.get('EMAIL_POLL_INTERVAL_SECONDS', 5))
+    # Sent/failed outbox rows older than this are purged by the workers
+    EMAIL_RETENTION_DAYS = int(os.environ.get('EMAIL_RETENTION_DAYS', 7))
+    EMAIL_PURGE_INTERVAL_SECONDS = int(os.environ.get('EMAIL_PURGE_INTERVAL_SECONDS', 3600))
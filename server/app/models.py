@@ -1,5 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.passwords import hash_method, needs_rehash
 from datetime import datetime, timezone
 
 db = SQLAlchemy()
@@ -18,6 +19,16 @@ class ProjectMember(db.Model):
     user = db.relationship('User', back_populates='project_memberships', foreign_keys=[user_id])
     project = db.relationship('Project', back_populates='members')
 
+    __table_args__ = (
+        db.Index('uq_project_members_project_user', 'project_id', 'user_id', unique=True),
+        db.Index(
+            'ix_project_members_pending_user', 'user_id',
+            postgresql_where=db.text("status = 'pending'"),
+            sqlite_where=db.text("status = 'pending'")
+        ),
+        db.Index('ix_project_members_user_status', 'user_id', 'status'),
+    )
+
 # -----------------------------
 # Activity Logs
 # -----------------------------
@@ -28,6 +39,10 @@ class ActivityLog(db.Model):
     action = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        db.Index('ix_activity_logs_created_at_id', 'created_at', 'id'),
+    )
+
 # -----------------------------
 # Classes / Specializations
 # -----------------------------
@@ -44,6 +59,11 @@ class Class(db.Model):
 # -----------------------------
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Serves the case-insensitive lookups in find_by_email
+        db.Index('ix_users_email_lower', db.text('lower(email)')),
+    )
+    __json_hidden__ = ('password_hash',)  # never emitted by the JSON provider
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
     email = db.Column(db.String(150), unique=True, nullable=False)
@@ -65,11 +85,24 @@ class User(db.Model):
     class_model = db.relationship('Class', back_populates='students') 
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=hash_method())
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
+
+    @staticmethod
+    def normalize_email(email):
+        """Emails are stored trimmed and lowercased"""
+        return str(email or '').strip().lower()
+
+    @classmethod
+    def find_by_email(cls, email):
+        # Case-insensitive, so accounts stored before emails were normalized still match
+        return cls.query.filter(db.func.lower(cls.email) == cls.normalize_email(email)).first()
+
 # -----------------------------
 # Projects
 # -----------------------------
@@ -91,6 +124,17 @@ class Project(db.Model):
     class_ref = db.relationship('Class', backref='projects', lazy=True)
     cohort = db.relationship('Cohort', backref='projects', lazy=True)
 
+    # Backing indexes for the GET /projects filters and sort keys
+    __table_args__ = (
+        db.Index('ix_projects_owner_id', 'owner_id'),
+        db.Index('ix_projects_class_id', 'class_id'),
+        db.Index('ix_projects_cohort_id', 'cohort_id'),
+        db.Index('ix_projects_status_id', 'status', 'id'),
+        db.Index('ix_projects_name_id', 'name', 'id'),
+        db.Index('ix_projects_created_at_id', 'created_at', 'id'),
+        db.Index('ix_projects_updated_at_id', 'updated_at', 'id'),
+    )
+
 # -----------------------------
 # Tasks
 # -----------------------------
@@ -107,6 +151,11 @@ class Task(db.Model):
     project = db.relationship('Project', back_populates='tasks')
     assignee = db.relationship('User', back_populates='tasks')
 
+    __table_args__ = (
+        db.Index('ix_tasks_project_id', 'project_id'),
+        db.Index('ix_tasks_assignee_id', 'assignee_id'),
+    )
+
 # -----------------------------
 # Cohorts
 # -----------------------------
@@ -117,3 +166,60 @@ class Cohort(db.Model):
     start_date = db.Column(db.Date, nullable=True)
     end_date = db.Column(db.Date, nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+# -----------------------------
+# Outbound email queue
+# -----------------------------
+class EmailMessage(db.Model):
+    __tablename__ = 'email_outbox'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # invitation, 2fa, verification
+    to_email = db.Column(db.String(150), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    html_body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+# -----------------------------
+# Pending 2FA login codes
+# -----------------------------
+class TwoFactorCode(db.Model):
+    __tablename__ = 'two_factor_codes'
+    __json_hidden__ = ('code_hash',)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    code_hash = db.Column(db.String(64), nullable=False)  # sha256 hex of the code
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+# -----------------------------
+# Per-table write counters (conditional GET validators)
+# -----------------------------
+class ResourceVersion(db.Model):
+    __tablename__ = 'resource_versions'
+    name = db.Column(db.String(64), primary_key=True)  # table name
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+
+# -----------------------------
+# Dashboard counts, maintained on every flush (see utils/summary_stats.py)
+# -----------------------------
+class ProjectStat(db.Model):
+    __tablename__ = 'project_stats'
+    cohort_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 0 = no cohort
+    class_id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # 0 = no class
+    status = db.Column(db.String(50), primary_key=True)  # '' = no status
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+class TaskStat(db.Model):
+    __tablename__ = 'task_stats'
+    project_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    status = db.Column(db.String(50), primary_key=True)  # '' = no status
+    count = db.Column(db.Integer, default=0, nullable=False)
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 from app.models import ActivityLog
 from app.utils.auth import token_required, role_required
-from app.utils.pagination import paginate
+from app.utils.pagination import paginate, pagination_meta, InvalidCursor
 import logging
 
 activity_routes = Blueprint('activity_routes', __name__)
@@ -36,11 +36,11 @@ def list_activities(current_user):
 
         return jsonify({
             'items': result,
-            'page': activities_paginated['page'],
-            'total_pages': activities_paginated['total_pages'],
-            'total_items': activities_paginated['total_items']
+            **pagination_meta(activities_paginated)
         }), 200
 
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to fetch activities: {str(e)}")
         return jsonify({'message': 'Failed to fetch activities', 'error': str(e)}), 500
@@ -1,10 +1,11 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.models import db, User
 from app.utils.auth import generate_jwt
 from app.utils.email_utils import send_2fa_code_email
+from app.utils.two_factor_store import two_fa_codes, VALID, MISSING, EXPIRED, LOCKED
+from app.utils.passwords import password_hasher, HasherBusy
 import random
 import string
-from datetime import datetime, timedelta
 import logging
 
 auth_routes = Blueprint('auth_routes', __name__)
@@ -15,9 +16,6 @@ auth_routes = Blueprint('auth_routes', __name__)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Temporary storage for 2FA codes (in production, use Redis or database)
-two_fa_codes = {}
-
 def generate_2fa_code():
     """Generate a random 6-digit 2FA code"""
     return ''.join(random.choices(string.digits, k=6))
@@ -29,14 +27,14 @@ def generate_2fa_code():
 def register():
     data = request.get_json()
     name = data.get('name')
-    email = data.get('email')
+    email = User.normalize_email(data.get('email'))
     password = data.get('password')
     role = data.get('role', 'Student')
 
     if not all([name, email, password]):
         return jsonify({'message': 'Name, email, and password are required'}), 400
 
-    if User.query.filter_by(email=email).first():
+    if User.find_by_email(email):
         return jsonify({'message': 'Email already registered'}), 400
 
     user = User(name=name, email=email, role=role)
@@ -59,31 +57,44 @@ def login():
     if not all([email, password]):
         return jsonify({'message': 'Email and password are required'}), 400
 
-    user = User.query.filter_by(email=email).first()
-    if not user or not user.check_password(password):
+    user = User.find_by_email(email)
+    try:
+        # Hashing runs on the bounded hasher pool
+        valid = user is not None and password_hasher.check(user.password_hash, password)
+    except HasherBusy:
+        logger.warning("Password hasher saturated; rejecting login")
+        return jsonify({'message': 'Too many login attempts in progress. Please retry shortly.'}), 503
+
+    if not valid:
         return jsonify({'message': 'Invalid credentials'}), 401
 
+    if password_hasher.needs_rehash(user.password_hash):
+        # Transparently upgrade hashes made with an outdated algorithm or cost;
+        # best effort, the password is already verified
+        try:
+            user.password_hash = password_hasher.hash(password)
+            db.session.commit()
+            logger.info(f"Upgraded password hash for user {user.id}")
+        except HasherBusy:
+            logger.warning(f"Password hasher saturated; deferring hash upgrade for user {user.id}")
+
     if user.two_factor_enabled:
         # Generate and send 2FA code via email
         code = generate_2fa_code()
-        expiry = datetime.now() + timedelta(minutes=10)
 
-        # Store code with expiry
-        two_fa_codes[user.id] = {
-            'code': code,
-            'expiry': expiry
-        }
+        # Store code with expiry (shared by all workers)
+        two_fa_codes.put(user.id, code)
 
-        # Send code via email
+        # Queue code email; delivery happens off the request
         try:
             send_2fa_code_email(user.email, code, user.name)
-            logger.info(f"2FA code sent to {user.email}")
+            logger.info(f"2FA code queued for {user.email}")
         except Exception as e:
-            logger.error(f"Failed to send 2FA code to {user.email}: {str(e)}")
+            logger.error(f"Failed to queue 2FA code for {user.email}: {str(e)}")
             # For development: log the code to console as fallback
             logger.warning(f"=== DEVELOPMENT MODE: 2FA CODE FOR {user.email} ===")
             logger.warning(f"=== CODE: {code} ===")
-            logger.warning(f"=== This code will expire in 10 minutes ===")
+            logger.warning(f"=== This code will expire in {current_app.config['TWO_FA_CODE_TTL_MINUTES']} minutes ===")
             # Continue with login instead of returning error
             pass
 
@@ -134,22 +145,22 @@ def verify_2fa():
     if not user or not user.two_factor_enabled:
         return jsonify({'message': '2FA not enabled for this user'}), 400
 
-    # Check if code exists and is not expired
-    if user_id not in two_fa_codes:
-        logger.warning(f"No 2FA code found for user_id: {user_id}. Available keys: {list(two_fa_codes.keys())}")
-        return jsonify({'message': 'No 2FA code found. Please request a new code.'}), 400
+    # Check the code; a valid code is consumed
+    result = two_fa_codes.verify(user_id, str(code))
 
-    stored_data = two_fa_codes[user_id]
+    if result == MISSING:
+        logger.warning(f"No 2FA code found for user_id: {user_id}")
+        return jsonify({'message': 'No 2FA code found. Please request a new code.'}), 400
 
-    if datetime.now() > stored_data['expiry']:
-        del two_fa_codes[user_id]
+    if result == EXPIRED:
         return jsonify({'message': '2FA code expired. Please login again.'}), 400
 
-    if code != stored_data['code']:
-        return jsonify({'message': 'Invalid 2FA code'}), 401
+    if result == LOCKED:
+        logger.warning(f"Too many invalid 2FA attempts for user_id: {user_id}")
+        return jsonify({'message': 'Too many invalid attempts. Please login again.'}), 429
 
-    # Code is valid - clear it and generate token
-    del two_fa_codes[user_id]
+    if result != VALID:
+        return jsonify({'message': 'Invalid 2FA code'}), 401
 
     try:
         token = generate_jwt(user.id, user.role)
@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.models import db, Class, User
+from app.utils.versions import conditional_get
+from app.utils.serializers import ClassSerializer, InvalidFields
+from app.utils.response_cache import cached
 
 class_bp = Blueprint('class_bp', __name__, url_prefix='/classes')
 
@@ -38,22 +41,22 @@ def create_class():
 # READ all classes
 # -----------------------------
 @class_bp.route('/', methods=['GET'])
+@conditional_get('classes')
+@cached('classes')
 def get_classes():
-    query = db.select(Class)
-    classes = db.session.execute(query).scalars().all()
-    result = [{
-        'id': cls.id,
-        'name': cls.name,
-        'created_at': cls.created_at.isoformat()
-    } for cls in classes]
-
-    return jsonify(result), 200
+    try:
+        fields = ClassSerializer.parse_fields(request.args.get('fields'))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    rows = db.session.execute(ClassSerializer.select(fields).order_by(Class.id)).all()
+    return jsonify([ClassSerializer.dump(row, fields) for row in rows]), 200
 
 
 # -----------------------------
 # READ single class by ID (with students)
 # -----------------------------
 @class_bp.route('/<int:class_id>', methods=['GET'])
+@cached('classes', 'users')
 def get_class(class_id):
     cls = db.session.get(Class, class_id)
     if not cls:
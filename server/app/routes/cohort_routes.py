@@ -1,8 +1,11 @@
 from flask import Blueprint, request, jsonify
-from app.models import db, Cohort
-from app.utils.auth import token_required, role_required
-from app.utils.pagination import paginate
+from app.models import db, Cohort, User
+from app.utils.auth import token_required, role_required, invalidate_user
+from app.utils.pagination import paginate, pagination_meta, InvalidCursor
 from app.utils.activity_log import log_activity
+from app.utils.versions import conditional_get
+from app.utils.response_cache import cached
+from app.utils.serializers import CohortSerializer, InvalidFields
 from datetime import datetime
 import logging
 
@@ -62,23 +65,30 @@ def add_cohort(current_user):
 # -----------------------------
 @cohort_routes.route('/cohorts/', methods=['GET'])
 @token_required
+@conditional_get('cohorts')
+@cached('cohorts')
 def list_cohorts(current_user):
     try:
-        cohorts_paginated = paginate(db.session.query(Cohort).order_by(Cohort.created_at.desc()), request)
-        items = [{
-            'id': c.id,
-            'name': c.name,
-            'start_date': c.start_date.isoformat() if c.start_date else None,
-            'end_date': c.end_date.isoformat() if c.end_date else None,
-            'created_at': c.created_at.isoformat()
-        } for c in cohorts_paginated['items']]
+        fields = CohortSerializer.parse_fields(request.args.get('fields'))
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    try:
+        # Only the requested columns are loaded (?fields=id,name,...); created_at
+        # is always loaded because the keyset cursor is built from it
+        query = (
+            db.session.query(Cohort)
+            .options(CohortSerializer.load_only(tuple(fields) + ('created_at',)))
+            .order_by(Cohort.created_at.desc())
+        )
+        cohorts_paginated = paginate(query, request)
+        items = [CohortSerializer.dump(c, fields) for c in cohorts_paginated['items']]
 
         return jsonify({
             'items': items,
-            'page': cohorts_paginated['page'],
-            'total_pages': cohorts_paginated['total_pages'],
-            'total_items': cohorts_paginated['total_items']
+            **pagination_meta(cohorts_paginated)
         }), 200
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to list cohorts: {str(e)}")
         return jsonify({'message': 'Failed to fetch cohorts', 'error': str(e)}), 500
@@ -164,9 +174,11 @@ def join_cohort(current_user, cohort_id):
     if not cohort:
         return jsonify({"message": "Cohort not found"}), 404
 
-    current_user.cohort_id = cohort.id
+    user = db.session.get(User, current_user.id)
+    user.cohort_id = cohort.id
     try:
         db.session.commit()
+        invalidate_user(user.id)
         log_activity(current_user.id, f"Joined cohort: {cohort.name}")
         logger.info(f"Student {current_user.email} joined cohort {cohort.name}")
         return jsonify({
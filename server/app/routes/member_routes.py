@@ -1,9 +1,11 @@
+import os
 from flask import Blueprint, request, jsonify
 from sqlalchemy.exc import SQLAlchemyError
 from app.models import db, Project, ProjectMember, User
 from app.utils.auth import token_required
 from app.utils.activity_log import log_activity
 from app.utils.email_utils import send_invitation_email
+from app.utils.templates import render
 
 member_routes = Blueprint('member_routes', __name__)
 
@@ -26,7 +28,7 @@ def invite_member(current_user, project_id):
     if not email:
         return jsonify({'message': 'Email is required'}), 400
 
-    user = User.query.filter_by(email=email).first()
+    user = User.find_by_email(email)
     if not user:
         return jsonify({'message': 'User not found'}), 404
 
@@ -40,28 +42,26 @@ def invite_member(current_user, project_id):
         db.session.commit()
         log_activity(current_user.id, f"Invited {user.email} as {role} to project {project.name}")
 
-        # Attempt to send email notification
-        email_sent = False
+        # Queue the email notification; delivery happens off the request
+        email_id = None
         email_error = None
         try:
-            send_invitation_email(user.email, project.name, current_user.name, project.id, user.id)
-            email_sent = True
-        except ValueError as ve:
-            # Invalid API key or configuration error
-            email_error = str(ve)
+            email_id = send_invitation_email(user.email, project.name, current_user.name, project.id, user.id).id
         except Exception as e:
-            # SendGrid API error or other issues
-            email_error = f"Email service error: {str(e)}"
+            email_error = f"Email queue error: {str(e)}"
 
         response_message = f'Invitation created as {role}'
-        if email_sent:
-            response_message += ' and email notification sent'
+        if email_id:
+            response_message += ' and email notification queued'
         else:
             response_message += f' but email notification failed: {email_error}'
 
         return jsonify({
             'message': response_message,
-            'email_sent': email_sent,
+            # Kept for existing clients; now means the email was queued
+            'email_sent': email_id is not None,
+            'email_queued': email_id is not None,
+            'email_id': email_id,
             'email_error': email_error
         }), 201
     except SQLAlchemyError as e:
@@ -164,8 +164,6 @@ def respond_invitation(current_user, project_id):
 @member_routes.route('/members/projects/<int:project_id>/respond-email/<int:user_id>/<action>', methods=['GET'])
 def respond_invitation_email(project_id, user_id, action):
     """Handle invitation response from email link"""
-    from flask import render_template_string
-
     if action not in ['accept', 'reject']:
         return "Invalid action", 400
 
@@ -173,31 +171,14 @@ def respond_invitation_email(project_id, user_id, action):
     user = db.session.get(User, user_id)
 
     if not project or not user:
-        return render_template_string("""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Invitation Not Found</title></head>
-            <body style="font-family: Arial; text-align: center; padding: 50px;">
-                <h1 style="color: #EF4444;">❌ Invitation Not Found</h1>
-                <p>This invitation link is invalid or has expired.</p>
-            </body>
-            </html>
-        """), 404
+        return render('pages/invitation_not_found.html'), 404
 
     invitation = ProjectMember.query.filter_by(project_id=project_id, user_id=user_id).first()
 
     if not invitation or invitation.status != 'pending':
-        return render_template_string("""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Invitation Already Responded</title></head>
-            <body style="font-family: Arial; text-align: center; padding: 50px;">
-                <h1 style="color: #F59E0B;">⚠️ Already Responded</h1>
-                <p>You have already responded to this invitation.</p>
-            </body>
-            </html>
-        """), 400
+        return render('pages/invitation_already_responded.html'), 400
 
+    frontend_url = os.environ.get('FRONTEND_URL', 'http://127.0.0.1:5173')
     try:
         if action == 'reject':
             # Remove the member if they reject
@@ -205,45 +186,15 @@ def respond_invitation_email(project_id, user_id, action):
             db.session.commit()
             log_activity(user_id, f"Rejected invitation for project {project.name}")
 
-            return render_template_string("""
-                <!DOCTYPE html>
-                <html>
-                <head><title>Invitation Rejected</title></head>
-                <body style="font-family: Arial; text-align: center; padding: 50px;">
-                    <h1 style="color: #EF4444;">❌ Invitation Rejected</h1>
-                    <p>You have successfully rejected the invitation to join <strong>{{ project_name }}</strong>.</p>
-                    <p style="margin-top: 30px;"><a href="{{ frontend_url }}/login" style="background-color: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px;">Go to Dashboard</a></p>
-                </body>
-                </html>
-            """, project_name=project.name, frontend_url="http://127.0.0.1:5173")
+            return render('pages/invitation_rejected.html', project_name=project.name, frontend_url=frontend_url)
         else:
             # Accept the invitation
             invitation.status = 'accepted'
             db.session.commit()
             log_activity(user_id, f"Accepted invitation for project {project.name}")
 
-            return render_template_string("""
-                <!DOCTYPE html>
-                <html>
-                <head><title>Invitation Accepted</title></head>
-                <body style="font-family: Arial; text-align: center; padding: 50px;">
-                    <h1 style="color: #10B981;">✅ Invitation Accepted!</h1>
-                    <p>You have successfully joined the project <strong>{{ project_name }}</strong>.</p>
-                    <p>You can now view this project in your dashboard.</p>
-                    <p style="margin-top: 30px;"><a href="{{ frontend_url }}/login" style="background-color: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px;">Go to Dashboard</a></p>
-                </body>
-                </html>
-            """, project_name=project.name, frontend_url="http://127.0.0.1:5173")
+            return render('pages/invitation_accepted.html', project_name=project.name, frontend_url=frontend_url)
 
     except SQLAlchemyError as e:
         db.session.rollback()
-        return render_template_string("""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Error</title></head>
-            <body style="font-family: Arial; text-align: center; padding: 50px;">
-                <h1 style="color: #EF4444;">❌ Error</h1>
-                <p>Failed to process your response. Please try again later.</p>
-            </body>
-            </html>
-        """), 500
+        return render('pages/invitation_error.html'), 500
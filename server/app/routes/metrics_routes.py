@@ -0,0 +1,43 @@
+import hmac
+from flask import Blueprint, Response, jsonify, current_app, request
+from app.utils.auth import token_required, role_required
+
+metrics_routes = Blueprint('metrics_routes', __name__)
+
+# -----------------------------
+# Connection pool statistics (Admin only, per worker)
+# -----------------------------
+@metrics_routes.route('/metrics/pool', methods=['GET'])
+@token_required
+@role_required(['Admin'])
+def pool_metrics(current_user):
+    return jsonify(current_app.extensions['pool_metrics'].snapshot()), 200
+
+# -----------------------------
+# Per-endpoint SQL statement counts and DB time (Admin only, per worker)
+# -----------------------------
+@metrics_routes.route('/metrics/queries', methods=['GET'])
+@token_required
+@role_required(['Admin'])
+def query_metrics(current_user):
+    return jsonify({'endpoints': current_app.extensions['query_stats'].snapshot()}), 200
+
+# -----------------------------
+# Response cache hit/miss counters (Admin only, per worker)
+# -----------------------------
+@metrics_routes.route('/metrics/cache', methods=['GET'])
+@token_required
+@role_required(['Admin'])
+def cache_metrics(current_user):
+    return jsonify(current_app.extensions['response_cache'].stats()), 200
+
+# -----------------------------
+# Prometheus scrape endpoint (all workers when PROMETHEUS_MULTIPROC_DIR is set)
+# -----------------------------
+@metrics_routes.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'message': 'Invalid metrics token'}), 401
+    body, content_type = current_app.extensions['prometheus'].render()
+    return Response(body, mimetype=content_type.split(';')[0], headers={'Content-Type': content_type})
@@ -1,10 +1,14 @@
 import logging
 from flask import Blueprint, request, jsonify
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
 from app.models import db, Project, ProjectMember, User, Class
 from app.utils.auth import token_required
-from app.utils.pagination import paginate
+from app.utils.pagination import paginate, pagination_meta, InvalidCursor
 from app.utils.activity_log import log_activity
+from app.utils.versions import conditional_get
+from app.utils.serializers import ProjectSerializer, InvalidFields
+from app.utils.search import search_projects, project_filter_criteria, project_sort_order, InvalidFilter
 from functools import wraps
 
 project_routes = Blueprint('project_routes', __name__)
@@ -70,65 +74,119 @@ def add_project(current_user):
         return jsonify({'message': 'Failed to create project'}), 500
 
 # -----------------------------
-# List projects (pagination + filtering)
+# List projects (pagination + filtering + sorting)
 # -----------------------------
 @project_routes.route('/projects', methods=['GET'])
 @token_required
+@conditional_get('projects', 'users', 'classes', 'cohorts', 'project_members')
 def list_projects(current_user):
-    query = db.session.query(Project)
+    try:
+        criteria = project_filter_criteria(request.args)
+        order_by = project_sort_order(request.args.get('sort'))
+        fields = ProjectSerializer.parse_fields(request.args.get('fields'))
+    except (InvalidFilter, InvalidFields) as e:
+        return jsonify({'message': str(e)}), 400
+    if 'cursor' in request.args and request.args.get('sort', '-created_at') != '-created_at':
+        return jsonify({'message': 'Cursor pagination is always ordered by -created_at'}), 400
+
+    # Eager-load every relationship the payload touches so a page costs a
+    # fixed number of queries regardless of per_page:
+    # page + count, members (with their users) via SELECT IN, and
+    # owner/class/cohort joined onto the page query itself.
+    # Only the requested project columns are loaded (?fields=id,name,...);
+    # created_at is always loaded because the keyset cursor is built from it.
+    query = (
+        db.session.query(Project)
+        .options(
+            ProjectSerializer.load_only(tuple(fields) + ('created_at',)),
+            selectinload(Project.members).joinedload(ProjectMember.user),
+            joinedload(Project.owner),
+            joinedload(Project.class_ref),
+            joinedload(Project.cohort),
+        )
+        .filter(*criteria)
+        .order_by(*order_by)
+    )
 
     # Students can see all projects (no filtering by status)
     # Admins can see all projects
     # No restrictions - everyone can see all projects
 
-    projects_paginated = paginate(query, request)
+    try:
+        projects_paginated = paginate(query, request)
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
+
     items = []
     for p in projects_paginated['items']:
         members = [{'id': m.user_id, 'name': m.user.name, 'email': m.user.email, 'status': m.status} for m in p.members]
 
-        # Get owner information
-        owner = db.session.get(User, p.owner_id) if p.owner_id else None
-        owner_name = owner.name if owner else 'Unknown'
+        owner_name = p.owner.name if p.owner else 'Unknown'
 
-        # Get class information
         class_info = None
-        if p.class_id:
-            project_class = db.session.get(Class, p.class_id)
-            if project_class:
-                class_info = {
-                    'id': project_class.id,
-                    'name': project_class.name
-                }
+        if p.class_ref:
+            class_info = {
+                'id': p.class_ref.id,
+                'name': p.class_ref.name
+            }
 
-        # Get cohort information
         cohort_info = None
-        if p.cohort_id:
-            from app.models import Cohort
-            project_cohort = db.session.get(Cohort, p.cohort_id)
-            if project_cohort:
-                cohort_info = {
-                    'id': project_cohort.id,
-                    'name': project_cohort.name
-                }
+        if p.cohort:
+            cohort_info = {
+                'id': p.cohort.id,
+                'name': p.cohort.name
+            }
 
+        items.append({
+            **ProjectSerializer.dump(p, fields),
+            'owner_name': owner_name,
+            'members': members,
+            'class': class_info,
+            'cohort': cohort_info
+        })
+
+    return jsonify({
+        'items': items,
+        **pagination_meta(projects_paginated)
+    }), 200
+
+# -----------------------------
+# Search projects (ranked full-text + filters, keyset paging)
+# -----------------------------
+@project_routes.route('/projects/search', methods=['GET'])
+@token_required
+@conditional_get('projects', 'project_members')
+def search_project_list(current_user):
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'message': 'Search query q is required'}), 400
+
+    try:
+        per_page = max(1, min(int(request.args.get('per_page', 10)), 100))
+        criteria = project_filter_criteria(request.args)
+        results = search_projects(q, criteria, request.args.get('cursor') or None, per_page)
+    except (InvalidFilter, InvalidCursor) as e:
+        return jsonify({'message': str(e)}), 400
+    except ValueError:
+        return jsonify({'message': 'per_page must be an integer'}), 400
+
+    items = []
+    for p, rank, highlights in results['items']:
         items.append({
             'id': p.id,
             'name': p.name,
             'description': p.description,
             'owner_id': p.owner_id,
-            'owner_name': owner_name,
-            'github_link': p.github_link,
+            'class_id': p.class_id,
+            'cohort_id': p.cohort_id,
             'status': p.status,
-            'members': members,
-            'class': class_info,
-            'cohort': cohort_info
+            'rank': rank,
+            'highlights': highlights
         })
 
     return jsonify({
         'items': items,
-        'page': projects_paginated['page'],
-        'total_pages': projects_paginated['total_pages'],
-        'total_items': projects_paginated['total_items']
+        **pagination_meta(results)
     }), 200
 
 # -----------------------------
@@ -136,6 +194,7 @@ def list_projects(current_user):
 # -----------------------------
 @project_routes.route('/projects/<int:project_id>', methods=['GET'])
 @token_required
+@conditional_get('projects', 'users', 'classes', 'cohorts', 'project_members')
 def get_project(current_user, project_id):
     project = db.session.get(Project, project_id)
     if not project:
@@ -0,0 +1,77 @@
+from flask import Blueprint, jsonify
+from app.models import db, Class, Cohort, Project, ProjectStat, TaskStat
+from app.utils.auth import token_required, role_required
+from app.utils.versions import conditional_get
+
+stats_routes = Blueprint('stats_routes', __name__)
+
+def _rollup(rows, key):
+    """Group summary rows by `key` with a per-status breakdown"""
+    groups = {}
+    for row in rows:
+        group = groups.setdefault(row[key], {key: row[key], 'count': 0, 'by_status': {}})
+        group['count'] += row['count']
+        group['by_status'][row['status']] = group['by_status'].get(row['status'], 0) + row['count']
+    return sorted(groups.values(), key=lambda group: group['count'], reverse=True)
+
+# -----------------------------
+# Dashboard aggregates from the summary tables (Admin only)
+# -----------------------------
+@stats_routes.route('/stats', methods=['GET'])
+@token_required
+@role_required(['Admin'])
+@conditional_get('projects', 'tasks', 'classes', 'cohorts')
+def dashboard_stats(current_user):
+    project_rows = [
+        {
+            'cohort_id': row.cohort_id or None,
+            'class_id': row.class_id or None,
+            'status': row.status,
+            'count': row.count
+        }
+        for row in db.session.execute(db.select(ProjectStat).where(ProjectStat.count > 0)).scalars()
+    ]
+    task_rows = [
+        {'project_id': project_id, 'project_name': name, 'status': status, 'count': count}
+        for project_id, name, status, count in db.session.execute(
+            db.select(TaskStat.project_id, Project.name, TaskStat.status, TaskStat.count)
+            .outerjoin(Project, Project.id == TaskStat.project_id)
+            .where(TaskStat.count > 0)
+        )
+    ]
+
+    cohort_names = dict(db.session.execute(db.select(Cohort.id, Cohort.name)).all())
+    class_names = dict(db.session.execute(db.select(Class.id, Class.name)).all())
+    by_cohort = _rollup(project_rows, 'cohort_id')
+    for group in by_cohort:
+        group['cohort_name'] = cohort_names.get(group['cohort_id'])
+    by_class = _rollup(project_rows, 'class_id')
+    for group in by_class:
+        group['class_name'] = class_names.get(group['class_id'])
+
+    by_project = _rollup(task_rows, 'project_id')
+    project_names = {row['project_id']: row['project_name'] for row in task_rows}
+    for group in by_project:
+        group['project_name'] = project_names.get(group['project_id'])
+
+    project_status = {}
+    for row in project_rows:
+        project_status[row['status']] = project_status.get(row['status'], 0) + row['count']
+    task_status = {}
+    for row in task_rows:
+        task_status[row['status']] = task_status.get(row['status'], 0) + row['count']
+
+    return jsonify({
+        'projects': {
+            'total': sum(row['count'] for row in project_rows),
+            'by_status': project_status,
+            'by_cohort': by_cohort,
+            'by_class': by_class,
+            'rows': project_rows
+        },
+        'tasks': {
+            'total': sum(row['count'] for row in task_rows),
+            'by_status': task_status,
+            'by_project': by_project
+        }
+    }), 200
@@ -1,7 +1,13 @@
 import logging
-from flask import Blueprint, request, jsonify, abort
+from functools import partial
+from flask import Blueprint, request, jsonify, abort, current_app, Response, stream_with_context
 from datetime import datetime
 from app.models import db, Task, Project, User
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from app.utils.streaming import stream_json_array, stream_ndjson
+from app.utils.versions import conditional_get
+from app.utils.serializers import TaskSerializer, InvalidFields
 
 task_bp = Blueprint('tasks', __name__, url_prefix='/tasks')
 
@@ -12,22 +18,51 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # -----------------------------
-# Get all tasks
+# Serialize a task
+# -----------------------------
+def task_to_dict(t, fields=None):
+    return TaskSerializer.dump(t, fields)
+
+# -----------------------------
+# Get all tasks (streamed; filters + optional pagination)
 # -----------------------------
 @task_bp.route('/', methods=['GET'])
 def get_tasks():
-    tasks = db.session.query(Task).all()
-    return jsonify([
-        {
-            'id': t.id,
-            'title': t.title,
-            'description': t.description,
-            'status': t.status,
-            'project_id': t.project_id,
-            'assignee_id': t.assignee_id,
-            'created_at': t.created_at.isoformat()
-        } for t in tasks
-    ]), 200
+    """
+    Streams tasks as a JSON array (default) or NDJSON (?format=ndjson).
+    Filters: project_id, assignee_id, status. Pagination: page, per_page.
+    Sparse fieldsets: ?fields=id,title,... selects only those columns.
+    Rows are read through a server-side cursor in batches of TASK_STREAM_BATCH_SIZE.
+    """
+    output = request.args.get('format', 'json')
+    if output not in ('json', 'ndjson'):
+        return jsonify({'error': 'format must be json or ndjson'}), 400
+    try:
+        fields = TaskSerializer.parse_fields(request.args.get('fields'))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+
+    query = TaskSerializer.select(fields).order_by(Task.id)
+    try:
+        for field in ('project_id', 'assignee_id'):
+            if request.args.get(field):
+                query = query.filter(getattr(Task, field) == int(request.args[field]))
+        if 'page' in request.args or 'per_page' in request.args:
+            page = max(int(request.args.get('page', 1)), 1)
+            per_page = max(int(request.args.get('per_page', 10)), 1)
+            query = query.limit(per_page).offset((page - 1) * per_page)
+    except ValueError:
+        return jsonify({'error': 'project_id, assignee_id, page and per_page must be integers'}), 400
+    if request.args.get('status'):
+        query = query.filter(Task.status == request.args['status'])
+
+    batch_size = current_app.config.get('TASK_STREAM_BATCH_SIZE', 500)
+    rows = db.session.execute(query.execution_options(yield_per=batch_size))
+    serialize = partial(task_to_dict, fields=fields)
+
+    if output == 'ndjson':
+        return Response(stream_with_context(stream_ndjson(rows, serialize)), mimetype='application/x-ndjson')
+    return Response(stream_with_context(stream_json_array(rows, serialize)), mimetype='application/json')
 
 # -----------------------------
 # Get a single task by ID
@@ -37,15 +72,7 @@ def get_task(task_id):
     task = db.session.get(Task, task_id)
     if not task:
         abort(404, description="Task not found")
-    return jsonify({
-        'id': task.id,
-        'title': task.title,
-        'description': task.description,
-        'status': task.status,
-        'project_id': task.project_id,
-        'assignee_id': task.assignee_id,
-        'created_at': task.created_at.isoformat()
-    }), 200
+    return jsonify(task_to_dict(task)), 200
 
 # -----------------------------
 # Create a new task
@@ -121,25 +148,69 @@ def delete_task(task_id):
     logger.info(f"Task {task.id} deleted")
     return jsonify({'message': 'Task deleted successfully'}), 200
 
+# -----------------------------
+# Serialize a task with its assignee
+# -----------------------------
+def board_task_to_dict(t):
+    return {
+        'id': t.id,
+        'title': t.title,
+        'description': t.description,
+        'status': t.status,
+        'assignee_id': t.assignee_id,
+        'assignee': {
+            'id': t.assignee.id,
+            'name': t.assignee.name,
+            'email': t.assignee.email
+        } if t.assignee else None
+    }
+
 # -----------------------------
 # Get all tasks for a specific project
 # -----------------------------
 @task_bp.route('/project/<int:project_id>', methods=['GET'])
+@conditional_get('tasks', 'users')
 def get_tasks_by_project(project_id):
-    tasks = db.session.query(Task).filter_by(project_id=project_id).all()
+    # Assignees are joined in the same query instead of lazy-loaded per task
+    tasks = db.session.execute(
+        db.select(Task)
+        .options(joinedload(Task.assignee))
+        .filter(Task.project_id == project_id)
+        .order_by(Task.id)
+    ).scalars().all()
+    return jsonify({
+        'tasks': [board_task_to_dict(t) for t in tasks]
+    }), 200
+
+# -----------------------------
+# Project task board (tasks + per-status counts)
+# -----------------------------
+@task_bp.route('/project/<int:project_id>/board', methods=['GET'])
+@conditional_get('tasks', 'users', 'projects')
+def get_project_board(project_id):
+    project = db.session.get(Project, project_id)
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+
+    tasks = db.session.execute(
+        db.select(Task)
+        .options(joinedload(Task.assignee))
+        .filter(Task.project_id == project_id)
+        .order_by(Task.id)
+    ).scalars().all()
+
+    # NULL statuses are counted under '' so every key is a string (the stdlib
+    # JSON fallback sorts keys and cannot compare None with str)
+    status = func.coalesce(Task.status, '')
+    counts = dict(db.session.execute(
+        db.select(status, func.count(Task.id))
+        .filter(Task.project_id == project_id)
+        .group_by(status)
+    ).all())
+
     return jsonify({
-        'tasks': [
-            {
-                'id': t.id,
-                'title': t.title,
-                'description': t.description,
-                'status': t.status,
-                'assignee_id': t.assignee_id,
-                'assignee': {
-                    'id': t.assignee.id,
-                    'name': t.assignee.name,
-                    'email': t.assignee.email
-                } if t.assignee else None
-            } for t in tasks
-        ]
+        'project': {'id': project.id, 'name': project.name, 'status': project.status},
+        'tasks': [board_task_to_dict(t) for t in tasks],
+        'counts': counts,
+        'total': sum(counts.values())
     }), 200
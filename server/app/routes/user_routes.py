@@ -1,9 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy.exc import SQLAlchemyError
 from app.models import db, User
-from app.utils.auth import token_required, role_required
+from app.utils.user_import import parse_rows, import_users, ImportFormatError
+from app.utils.auth import token_required, role_required, invalidate_user
+from app.utils.serializers import UserSerializer, InvalidFields
+import logging
 
 user_routes = Blueprint('user_routes', __name__)
 
+# -----------------------------
+# Configure logger
+# -----------------------------
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
 # -----------------------------
 # List all users (Admin only)
 # -----------------------------
@@ -11,9 +21,13 @@ user_routes = Blueprint('user_routes', __name__)
 @token_required
 @role_required(['Admin'])
 def list_users(current_user):
-    users = db.session.execute(db.select(User)).scalars().all()
-    result = [{'id': u.id, 'name': u.name, 'email': u.email, 'role': u.role} for u in users]
-    return jsonify(result), 200
+    # Only the requested columns are selected (?fields=id,name,...); password_hash is never read
+    try:
+        fields = UserSerializer.parse_fields(request.args.get('fields'))
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+    rows = db.session.execute(UserSerializer.select(fields).order_by(User.id)).all()
+    return jsonify([UserSerializer.dump(row, fields) for row in rows]), 200
 
 # -----------------------------
 # Get single user (Admin or self)
@@ -41,7 +55,7 @@ def create_user(current_user):
     data = request.get_json()
     user = User(
         name=data['name'],
-        email=data['email'],
+        email=User.normalize_email(data['email']),
         role=data.get('role', 'Student')
     )
     user.set_password(data['password'])
@@ -49,6 +63,43 @@ def create_user(current_user):
     db.session.commit()
     return jsonify({'message': 'User created successfully', 'id': user.id}), 201
 
+# -----------------------------
+# Bulk import users (Admin only)
+# -----------------------------
+@user_routes.route('/users/import', methods=['POST'])
+@token_required
+@role_required(['Admin'])
+def bulk_import_users(current_user):
+    """
+    Import users from a CSV (text/csv) or JSON-lines (application/x-ndjson) body.
+    Returns a per-row report; valid rows are inserted even if others fail.
+    """
+    try:
+        rows = parse_rows(request.get_data(), request.mimetype or '')
+    except (ImportFormatError, UnicodeDecodeError) as e:
+        return jsonify({'message': f'Could not parse upload: {str(e)}'}), 400
+
+    if not rows:
+        return jsonify({'message': 'No rows to import'}), 400
+    max_rows = current_app.config.get('USER_IMPORT_MAX_ROWS', 5000)
+    if len(rows) > max_rows:
+        return jsonify({'message': f'Too many rows; the limit is {max_rows}'}), 413
+
+    try:
+        results = import_users(rows, processes=current_app.config.get('USER_IMPORT_PROCESSES', 1))
+    except SQLAlchemyError:
+        db.session.rollback()
+        # The exception text carries the statement parameters, password hashes included
+        logger.exception(f"Bulk import by admin {current_user.id} failed")
+        return jsonify({'message': 'Failed to import users'}), 500
+
+    created = sum(1 for r in results if r['status'] == 'created')
+    return jsonify({
+        'created': created,
+        'failed': len(results) - created,
+        'results': results
+    }), 200
+
 # -----------------------------
 # Update user (Admin or self)
 # -----------------------------
@@ -72,6 +123,7 @@ def update_user(current_user, user_id):
     if data.get('password'):
         user.set_password(data['password'])
     db.session.commit()
+    invalidate_user(user.id)
     return jsonify({'message': 'User updated successfully'})
 
 # -----------------------------
@@ -90,4 +142,5 @@ def delete_user(current_user, user_id):
 
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
     return jsonify({'message': 'User deleted successfully'})
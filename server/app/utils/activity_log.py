@@ -1,9 +1,142 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from flask import current_app, has_app_context
+from sqlalchemy import insert
 from app.models import db, ActivityLog
 
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ActivityLogWriter:
+    """
+    Buffers activity log rows and writes them from a background thread.
+
+    Rows are flushed with a single multi-row INSERT once
+    ACTIVITY_LOG_BATCH_SIZE rows are buffered or ACTIVITY_LOG_FLUSH_INTERVAL_MS
+    has passed since the first buffered row, whichever comes first.
+    The buffer is drained when the process exits.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.batch_size = 100
+        self.flush_interval = 0.5
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.batch_size = app.config.get('ACTIVITY_LOG_BATCH_SIZE', 100)
+        self.flush_interval = app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL_MS', 500) / 1000
+        self._queue = queue.Queue(maxsize=app.config.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+        app.extensions['activity_log_writer'] = self
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def is_async(self, app):
+        """Tests and ACTIVITY_LOG_ASYNC=false fall back to inline writes"""
+        return self.app is not None and app.config.get('ACTIVITY_LOG_ASYNC', True) and not app.testing
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def enqueue(self, row):
+        """Buffer a row; returns False if the buffer is full"""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def shutdown(self, timeout=5):
+        """Flush everything still buffered and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            self._flush(batch)
+
+        # Drain whatever was enqueued behind the stop marker
+        leftover = []
+        while True:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is not _STOP:
+                leftover.append(row)
+        for start in range(0, len(leftover), self.batch_size):
+            self._flush(leftover[start:start + self.batch_size])
+
+    def _flush(self, rows):
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(insert(ActivityLog.__table__).values(rows))
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} activity log rows: {str(e)}")
+
+
+activity_writer = ActivityLogWriter()
+
+
 def log_activity(user_id, action):
     """
-    Logs any action performed by a user
+    Logs any action performed by a user.
+    The row is handed to the background writer; the caller does not wait for the INSERT.
     """
-    log = ActivityLog(user_id=user_id, action=action)
+    row = {
+        'user_id': user_id,
+        'action': action,
+        'created_at': datetime.now(timezone.utc)
+    }
+    if has_app_context() and activity_writer.is_async(current_app) and activity_writer.enqueue(row):
+        return
+
+    log = ActivityLog(**row)
     db.session.add(log)
     db.session.commit()
@@ -1,11 +1,14 @@
 import jwt
 import os
+import hashlib
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from functools import wraps
 from flask import request, jsonify, current_app
 from app.models import User
 from app import db
+from app.utils.cache import TTLCache, RedisCache
 
 # -----------------------------
 # Configure logger
@@ -13,6 +16,119 @@ from app import db
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# -----------------------------
+# Authenticated user cache
+# -----------------------------
+class UserPrincipal:
+    """
+    Slim, session-independent view of the authenticated user passed to routes
+    as current_user. Load the User row when a route needs to modify it.
+    """
+    FIELDS = ('id', 'role', 'name', 'email', 'cohort_id', 'class_id')
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(**{name: getattr(user, name) for name in cls.FIELDS})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class PrincipalCache:
+    """
+    Caches UserPrincipal fields by user id so token_required can skip the
+    users lookup. USER_CACHE_BACKEND=memory keeps a per-process TTL/LRU cache;
+    USER_CACHE_BACKEND=redis shares it so invalidations reach every worker.
+    """
+
+    def __init__(self, app=None):
+        self.backend = TTLCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        ttl = app.config.get('USER_CACHE_TTL_SECONDS', 60)
+        if app.config.get('USER_CACHE_BACKEND', 'memory') == 'redis':
+            self.backend = RedisCache(app.config['USER_CACHE_REDIS_URL'], prefix='principal:', ttl=ttl)
+        else:
+            self.backend = TTLCache(maxsize=app.config.get('USER_CACHE_MAX_SIZE', 10000), ttl=ttl)
+        app.extensions['principal_cache'] = self
+
+    def get(self, user_id):
+        fields = self.backend.get(str(user_id))
+        return UserPrincipal(**fields) if fields else None
+
+    def load(self, user_id):
+        """Return the cached principal, falling back to the users table"""
+        principal = self.get(user_id)
+        if principal is None:
+            user = db.session.get(User, user_id)
+            if not user:
+                return None
+            principal = UserPrincipal.from_user(user)
+            self.backend.set(str(user_id), principal.to_dict())
+        return principal
+
+    def invalidate(self, user_id):
+        self.backend.delete(str(user_id))
+
+    def clear(self):
+        self.backend.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_user(user_id):
+    """Drop a user's cached principal after a write that changes it"""
+    principal_cache.invalidate(user_id)
+
+# -----------------------------
+# Verified token cache
+# -----------------------------
+class VerifiedTokenCache:
+    """
+    Maps the SHA-256 digest of a bearer token to its decoded claims so a
+    token that already passed HS256 verification is not verified again.
+    Entries expire at the token's own exp; tokens without exp are not cached.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.cache = TTLCache(maxsize=10000)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('JWT_CACHE_ENABLED', True)
+        self.cache = TTLCache(maxsize=app.config.get('JWT_CACHE_MAX_SIZE', 10000))
+        app.extensions['token_cache'] = self
+
+    def decode(self, token, secret_key):
+        if not self.enabled:
+            return jwt.decode(token, secret_key, algorithms=["HS256"])
+
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self.cache.get(digest)
+        if claims is not None:
+            return claims
+
+        claims = jwt.decode(token, secret_key, algorithms=["HS256"])
+        exp = claims.get("exp")
+        if exp is not None:
+            remaining = exp - time.time()
+            if remaining > 0:
+                self.cache.set(digest, claims, ttl=remaining)
+        return claims
+
+
+token_cache = VerifiedTokenCache()
+
 # -----------------------------
 # Generate JWT Access Token
 # -----------------------------
@@ -40,7 +156,7 @@ def generate_jwt(user_id, role, expires_hours=1):
 def token_required(f):
     """
     Decorator to protect routes requiring JWT authentication.
-    Adds 'current_user' as the first argument to the route.
+    Adds 'current_user' (a UserPrincipal) as the first argument to the route.
     """
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -56,9 +172,9 @@ def token_required(f):
 
         try:
             secret_key = current_app.config.get("SECRET_KEY") or os.environ.get("SECRET_KEY")
-            data = jwt.decode(token, secret_key, algorithms=["HS256"])
-            # Use SQLAlchemy 2.x Session.get() instead of legacy Query.get()
-            current_user = db.session.get(User, data["user_id"])
+            data = token_cache.decode(token, secret_key)
+            # Cached principal; only a cache miss queries the users table
+            current_user = principal_cache.load(data["user_id"])
             if not current_user:
                 raise Exception("User not found")
         except jwt.ExpiredSignatureError:
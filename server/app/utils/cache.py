@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a TTL.
+    Least recently used entries are evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    Same interface as TTLCache, stored in Redis so every gunicorn worker
+    shares entries and sees deletes. Values must be JSON-serializable.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url, prefix='cache:', ttl=60):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis package is required for the redis cache backend") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+
+    def get(self, key, default=None):
+        raw = self.client.get(self._key(key))
+        return default if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self.client.set(self._key(key), json.dumps(value), px=max(int(ttl * 1000), 1))
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def clear(self):
+        for name in self.client.scan_iter(match=f"{self.prefix}*"):
+            self.client.delete(name)
@@ -0,0 +1,129 @@
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Types that are worth compressing; images, archives etc. are already compressed
+COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'image/svg+xml',
+)
+
+
+def _zlib_compressor(encoding, level):
+    # gzip wraps deflate in a gzip header; HTTP "deflate" is the zlib format
+    wbits = 16 + zlib.MAX_WBITS if encoding == 'gzip' else zlib.MAX_WBITS
+    compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        lambda: compressor.flush(zlib.Z_FINISH),
+    )
+
+
+def _brotli_compressor(quality):
+    compressor = brotli.Compressor(quality=quality)
+    return (
+        lambda chunk: compressor.process(chunk) + compressor.flush(),
+        compressor.finish,
+    )
+
+
+class Compressor:
+    """
+    Compresses responses with the best encoding the client accepts
+    (br when the brotli package is installed, then gzip, then deflate).
+
+    Buffered responses below COMPRESS_MIN_SIZE bytes go out as-is. Streamed
+    responses are compressed chunk by chunk and flushed after every chunk,
+    so clients still receive rows as they are produced.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['compressor'] = self
+        app.after_request(self.after_request)
+
+    def encodings(self):
+        supported = ['br'] if brotli is not None and self.app.config.get('COMPRESS_BROTLI', True) else []
+        return supported + ['gzip', 'deflate']
+
+    def choose_encoding(self, accept_encodings):
+        """Pick the highest-q encoding we support; ties go to the better compressor"""
+        return accept_encodings.best_match(self.encodings())
+
+    def compress(self, data, encoding):
+        write, finish = self._compressor(encoding)
+        return write(data) + finish()
+
+    def after_request(self, response):
+        config = self.app.config
+        if not config.get('COMPRESS_ENABLED', True):
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or 'Content-Encoding' in response.headers
+            or response.direct_passthrough
+        ):
+            return response
+
+        encoding = self.choose_encoding(request.accept_encodings)
+        if not encoding:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < config.get('COMPRESS_MIN_SIZE', 500):
+                return response
+            response.set_data(self.compress(data, encoding))
+
+        response.headers['Content-Encoding'] = encoding
+        # The compressed body is a different representation: a strong ETag no longer matches it
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compressor(self, encoding):
+        if encoding == 'br':
+            return _brotli_compressor(self.app.config.get('COMPRESS_BROTLI_QUALITY', 4))
+        return _zlib_compressor(encoding, self.app.config.get('COMPRESS_LEVEL', 6))
+
+    def _stream(self, body, encoding):
+        write, finish = self._compressor(encoding)
+        try:
+            for chunk in body:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if chunk:
+                    yield write(chunk)
+            yield finish()
+        finally:
+            # Close the wrapped body so stream_with_context and cursors are released
+            close = getattr(body, 'close', None)
+            if close is not None:
+                close()
+
+
+compressor = Compressor()
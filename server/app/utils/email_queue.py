@@ -0,0 +1,283 @@
+import atexit
+import logging
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.mime.text import MIMEText
+from flask import current_app
+from sqlalchemy import delete, update
+from app.models import db, EmailMessage
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Transports
+# -----------------------------
+class SendGridTransport:
+    """
+    Delivers through the SendGrid API with one client per process
+    """
+    def __init__(self, config):
+        import sendgrid
+
+        api_key = config.get('SENDGRID_API_KEY') or os.environ.get('SENDGRID_API_KEY')
+        if not api_key:
+            logger.error("SENDGRID_API_KEY not found in environment variables")
+            raise ValueError("SendGrid API key not configured")
+
+        if len(api_key) < 50 or not api_key.startswith('SG.'):
+            logger.error(f"Invalid SendGrid API key format (length: {len(api_key)})")
+            raise ValueError("SendGrid API key appears to be invalid. Valid keys start with 'SG.' and are 69+ characters long")
+
+        self.client = sendgrid.SendGridAPIClient(api_key=api_key)
+        self.sender = os.environ.get('SENDGRID_SENDER_EMAIL', 'no-reply@projectx.com')
+
+    def send(self, to_email, subject, html_body):
+        from sendgrid.helpers.mail import Mail, Email, To, Content
+
+        mail = Mail(Email(self.sender), To(to_email), subject, Content("text/html", html_body))
+        response = self.client.send(mail)
+        if response.status_code >= 300:
+            raise RuntimeError(f"SendGrid responded with status {response.status_code}")
+
+
+class SMTPTransport:
+    """
+    Delivers over plain SMTP, e.g. to a local sink such as MailHog in development
+    """
+    def __init__(self, config):
+        self.host = config.get('EMAIL_SMTP_HOST', 'localhost')
+        self.port = int(config.get('EMAIL_SMTP_PORT', 1025))
+        self.sender = os.environ.get('SENDGRID_SENDER_EMAIL', 'no-reply@projectx.com')
+
+    def send(self, to_email, subject, html_body):
+        message = MIMEText(html_body, 'html')
+        message['Subject'] = subject
+        message['From'] = self.sender
+        message['To'] = to_email
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(message)
+
+
+class MemoryTransport:
+    """
+    Keeps delivered messages in memory; used by tests
+    """
+    def __init__(self, config=None):
+        self.outbox = []
+        self.fail_with = None
+
+    def send(self, to_email, subject, html_body):
+        if self.fail_with:
+            raise self.fail_with
+        self.outbox.append({'to': to_email, 'subject': subject, 'html': html_body})
+
+
+TRANSPORTS = {
+    'sendgrid': SendGridTransport,
+    'smtp': SMTPTransport,
+    'memory': MemoryTransport,
+}
+
+# -----------------------------
+# Delivery queue
+# -----------------------------
+class EmailQueue:
+    """
+    Persistent outbound email queue backed by the email_outbox table.
+
+    Endpoints enqueue a row and return; a pool of EMAIL_WORKERS threads claims
+    due rows, hands them to the configured transport and records the outcome.
+    Failures are retried with exponential backoff up to EMAIL_MAX_ATTEMPTS.
+    Bodies (which may hold 2FA codes) are cleared once a message is sent or
+    given up on, and finished rows older than EMAIL_RETENTION_DAYS are purged.
+    In testing mode (or EMAIL_QUEUE_SYNC) messages are delivered inline.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.transport = None
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        self._last_purge = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.transport = None
+        app.extensions['email_queue'] = self
+        app.before_request(self._ensure_workers)
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    @property
+    def workers(self):
+        return self.app.config.get('EMAIL_WORKERS', 2)
+
+    @property
+    def max_attempts(self):
+        return self.app.config.get('EMAIL_MAX_ATTEMPTS', 5)
+
+    def is_sync(self):
+        return self.app.testing or self.app.config.get('EMAIL_QUEUE_SYNC', False)
+
+    def get_transport(self):
+        if self.transport is None:
+            name = self.app.config.get('EMAIL_TRANSPORT', 'sendgrid')
+            self.transport = TRANSPORTS[name](self.app.config)
+        return self.transport
+
+    def pending_count(self):
+        return db.session.query(EmailMessage).filter(EmailMessage.status.in_(['pending', 'sending'])).count()
+
+    def enqueue(self, kind, to_email, subject, html_body):
+        """
+        Store a message for delivery and return it without waiting on the transport
+        """
+        message = EmailMessage(kind=kind, to_email=to_email, subject=subject, html_body=html_body)
+        db.session.add(message)
+        db.session.commit()
+
+        if self.is_sync():
+            self._deliver(message)
+            db.session.commit()
+        else:
+            self._ensure_workers()
+            self._wakeup.set()
+        return message
+
+    def shutdown(self, timeout=5):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stop.clear()
+
+    def _ensure_workers(self):
+        if self.is_sync() or self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'email-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        poll_interval = self.app.config.get('EMAIL_POLL_INTERVAL_SECONDS', 5)
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    delivered = self.process_due()
+                    self._maybe_purge()
+            except Exception as e:
+                logger.error(f"Email worker error: {str(e)}")
+                delivered = 0
+            if not delivered:
+                self._wakeup.wait(poll_interval)
+                self._wakeup.clear()
+
+    def _maybe_purge(self):
+        interval = self.app.config.get('EMAIL_PURGE_INTERVAL_SECONDS', 3600)
+        with self._lock:
+            if time.monotonic() - self._last_purge < interval:
+                return
+            self._last_purge = time.monotonic()
+        self.purge_finished()
+
+    def purge_finished(self, now=None):
+        """Delete sent and failed messages older than EMAIL_RETENTION_DAYS; returns how many"""
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.app.config.get('EMAIL_RETENTION_DAYS', 7))
+        result = db.session.execute(
+            delete(EmailMessage)
+            .where(EmailMessage.status.in_(['sent', 'failed']), EmailMessage.created_at < cutoff)
+        )
+        db.session.commit()
+        if result.rowcount:
+            logger.info(f"Purged {result.rowcount} finished emails older than {cutoff.isoformat()}")
+        return result.rowcount
+
+    def process_due(self, batch_size=10):
+        """
+        Claim and deliver up to batch_size due messages; returns how many were attempted.
+        Claimed rows get a lease so a crashed worker's messages are picked up again.
+        """
+        now = datetime.now(timezone.utc)
+        lease = timedelta(seconds=self.app.config.get('EMAIL_LEASE_SECONDS', 300))
+        due = (
+            db.session.query(EmailMessage.id)
+            .filter(EmailMessage.status.in_(['pending', 'sending']), EmailMessage.next_attempt_at <= now)
+            .order_by(EmailMessage.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        # Conditional UPDATE so two workers can never claim the same row,
+        # even on databases without SKIP LOCKED
+        claimed = []
+        for (message_id,) in due:
+            result = db.session.execute(
+                update(EmailMessage)
+                .where(
+                    EmailMessage.id == message_id,
+                    EmailMessage.status.in_(['pending', 'sending']),
+                    EmailMessage.next_attempt_at <= now
+                )
+                .values(status='sending', next_attempt_at=now + lease)
+            )
+            if result.rowcount:
+                claimed.append(message_id)
+        db.session.commit()
+
+        if not claimed:
+            return 0
+        messages = db.session.query(EmailMessage).filter(EmailMessage.id.in_(claimed)).order_by(EmailMessage.id).all()
+        for message in messages:
+            self._deliver(message)
+            db.session.commit()
+        return len(messages)
+
+    def _deliver(self, message):
+        message.attempts += 1
+        try:
+            self.get_transport().send(message.to_email, message.subject, message.html_body)
+        except Exception as e:
+            message.last_error = str(e)
+            if message.attempts >= self.max_attempts:
+                message.status = 'failed'
+                message.html_body = ''
+                logger.error(f"Giving up on {message.kind} email {message.id} to {message.to_email}: {str(e)}")
+            else:
+                base = self.app.config.get('EMAIL_RETRY_BASE_SECONDS', 30)
+                delay = min(base * 2 ** (message.attempts - 1), 3600)
+                message.status = 'pending'
+                message.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                logger.warning(f"{message.kind} email {message.id} failed (attempt {message.attempts}), retrying in {delay}s: {str(e)}")
+            return False
+
+        message.status = 'sent'
+        # Drop the rendered body; 2FA emails carry the plaintext code
+        message.html_body = ''
+        message.last_error = None
+        message.sent_at = datetime.now(timezone.utc)
+        logger.info(f"{message.kind} email {message.id} sent to {message.to_email}")
+        return True
+
+
+email_queue = EmailQueue()
+
+
+def enqueue_email(kind, to_email, subject, html_body):
+    """Queue an email on the current app's delivery queue"""
+    return current_app.extensions['email_queue'].enqueue(kind, to_email, subject, html_body)
@@ -0,0 +1,171 @@
+import atexit
+import json
+import logging
+import os
+import select
+import threading
+from sqlalchemy import text
+from app.models import db
+from app.utils.auth import principal_cache
+from app.utils.cache import TTLCache
+from app.utils.response_cache import response_cache
+from app.utils.versions import on_write
+
+logger = logging.getLogger(__name__)
+
+# Writes to these tables are broadcast to the other workers
+BUS_TABLES = ('users', 'projects', 'classes', 'cohorts', 'project_members')
+
+
+def apply_invalidation(tables):
+    """Evict this worker's cached data for tables another worker wrote"""
+    response_cache.evict_tables(tables)
+    if 'users' in tables and isinstance(principal_cache.backend, TTLCache):
+        # Redis-backed principals are shared and were invalidated by the writer
+        principal_cache.clear()
+
+
+def flush_local_caches():
+    """Drop everything cached in this worker; used when notifications may have been missed"""
+    response_cache.clear()
+    if isinstance(principal_cache.backend, TTLCache):
+        principal_cache.clear()
+
+
+class InvalidationBus:
+    """
+    Broadcasts cache invalidations between gunicorn workers over Postgres
+    LISTEN/NOTIFY.
+
+    Writes to BUS_TABLES queue a pg_notify inside the writing transaction, so
+    the notification is delivered only if it commits. Each worker runs a
+    listener thread on a dedicated connection and evicts the named tables
+    from its local caches. After the listener reconnects, all local caches
+    are flushed because notifications sent in the meantime were lost.
+    Only active on PostgreSQL; other databases keep per-worker caches only.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        self.dialect = None
+        self.received = 0
+        self.reconnects = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        with app.app_context():
+            self.dialect = db.engine.dialect.name
+        app.extensions['invalidation_bus'] = self
+        app.before_request(self._ensure_listener)
+        on_write(self._publish)
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    @property
+    def channel(self):
+        return self.app.config.get('INVALIDATION_CHANNEL', 'cache_invalidation')
+
+    def is_active(self):
+        if self.app is None or not self.app.config.get('INVALIDATION_BUS_ENABLED', True):
+            return False
+        return self.dialect == 'postgresql'
+
+    def _publish(self, session, tables):
+        tables = sorted(set(tables) & set(BUS_TABLES))
+        if not tables or not self.is_active():
+            return
+        payload = json.dumps({'pid': os.getpid(), 'tables': tables})
+        session.connection().execute(
+            text('SELECT pg_notify(:channel, :payload)'), {'channel': self.channel, 'payload': payload}
+        )
+
+    def handle(self, payload):
+        """Apply one notification payload; notifications from this process are skipped"""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation payload: {payload!r}")
+            return
+        if message.get('pid') == os.getpid():
+            return
+        self.received += 1
+        apply_invalidation(frozenset(message.get('tables') or ()))
+
+    def shutdown(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._stop.clear()
+
+    def _ensure_listener(self):
+        if self.app.testing or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if not self.is_active():
+                return
+            self._thread = threading.Thread(target=self._run, name='invalidation-listener', daemon=True)
+            self._thread.start()
+
+    def _connect(self):
+        with self.app.app_context():
+            proxied = db.engine.raw_connection()
+        # Keep the LISTEN connection out of the pool for the life of the thread
+        proxied.detach()
+        connection = proxied.driver_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return connection
+
+    def _run(self):
+        delay = 1
+        connected_before = False
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                # Anything cached before LISTEN took effect may have missed a notification
+                flush_local_caches()
+                if connected_before:
+                    self.reconnects += 1
+                    logger.warning("Invalidation listener reconnected; flushed local caches")
+                connected_before = True
+                delay = 1
+                self._listen(connection)
+            except Exception as e:
+                logger.error(f"Invalidation listener error: {str(e)}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _listen(self, connection):
+        # psycopg2-style API: poll() fills connection.notifies
+        interval = self.app.config.get('INVALIDATION_PING_SECONDS', 30)
+        while not self._stop.is_set():
+            if select.select([connection], [], [], interval) == ([], [], []):
+                # Idle: make sure the server is still there so a dead socket triggers a reconnect
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                continue
+            connection.poll()
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                self.handle(notification.payload)
+
+
+invalidation_bus = InvalidationBus()
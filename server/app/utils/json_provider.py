@@ -0,0 +1,88 @@
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import inspect
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def model_to_dict(obj):
+    """
+    Column values of an ORM row; columns listed in the model's
+    __json_hidden__ (e.g. password_hash) are never emitted
+    """
+    hidden = getattr(obj, '__json_hidden__', ())
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(obj).mapper.column_attrs
+        if attr.key not in hidden
+    }
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed and with the
+    stdlib encoder otherwise. Both paths emit datetimes, dates and times in
+    ISO 8601 and serialize ORM rows and result rows as objects, so routes can
+    return them without converting by hand.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        if isinstance(o, Row):
+            return o._asdict()
+        if hasattr(o, '__mapper__'):
+            return model_to_dict(o)
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            return dataclasses.asdict(o)
+        if hasattr(o, '__html__'):
+            return str(o.__html__())
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    @property
+    def accelerated(self):
+        return orjson is not None
+
+    def _orjson_options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _pretty(self):
+        return self.compact is None and self._app.debug or self.compact is False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode('utf-8')
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; the stdlib encoder handles them
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is not None:
+            try:
+                body = orjson.dumps(obj, default=self.default, option=self._orjson_options(self._pretty()))
+                return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+            except orjson.JSONEncodeError:
+                pass
+        return super().response(*args, **kwargs)
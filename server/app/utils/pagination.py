@@ -1,9 +1,31 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a keyset cursor cannot be decoded"""
+
+
 def paginate(query, request):
     """
     Simple pagination helper
+
+    Offset mode (default): ?page=<n>&per_page=<n>, returns page,
+    total_pages and total_items.
+
+    Keyset mode: pass ?cursor= (empty for the first page, then the
+    returned next_cursor). Rows are ordered by (created_at, id) descending
+    and no OFFSET scan or COUNT(*) is run unless ?include_total=true.
     """
-    page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 10))
+    if 'cursor' in request.args:
+        include_total = request.args.get('include_total', '').lower() in ('1', 'true', 'yes')
+        return keyset_paginate(query, request.args.get('cursor') or None, per_page, include_total)
+
+    page = int(request.args.get('page', 1))
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     return {
         'items': pagination.items,
@@ -11,3 +33,54 @@ def paginate(query, request):
         'total_pages': pagination.pages,
         'total_items': pagination.total
     }
+
+
+def keyset_paginate(query, cursor, per_page, include_total=False):
+    """
+    Cursor pagination keyed on (created_at, id) of the query's primary entity
+    """
+    model = query.column_descriptions[0]['entity']
+    total = query.order_by(None).count() if include_total else None
+
+    query = query.order_by(None).order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < last_id)
+        ))
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'per_page': per_page,
+        'total_items': total
+    }
+
+
+def pagination_meta(paginated):
+    """
+    Everything in a paginate() result except the items, for the response body
+    """
+    return {key: value for key, value in paginated.items() if key != 'items'}
+
+
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
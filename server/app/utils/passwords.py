@@ -0,0 +1,96 @@
+import logging
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+
+class HasherBusy(Exception):
+    """Raised when too many password hashes are already queued, or one did not finish in time"""
+
+
+def hash_method():
+    """The configured Werkzeug hash method, e.g. scrypt:32768:8:1 or pbkdf2:sha256:600000"""
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+    return DEFAULT_HASH_METHOD
+
+
+@lru_cache(maxsize=8)
+def stored_prefix(method):
+    """
+    The method prefix Werkzeug stores for `method`; short names are expanded
+    (scrypt -> scrypt:32768:8:1, pbkdf2 -> pbkdf2:sha256:<iterations>)
+    """
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def needs_rehash(password_hash, method=None):
+    """True if a stored hash was made with a different algorithm or cost than configured"""
+    return password_hash.split('$', 1)[0] != stored_prefix(method or hash_method())
+
+
+class PasswordHasher:
+    """
+    Runs login-time hashing on a bounded thread pool.
+
+    At most PASSWORD_HASH_WORKERS hashes run at once and at most
+    PASSWORD_HASH_QUEUE_LIMIT may be in flight; beyond that HasherBusy is
+    raised so a login storm is rejected early instead of tying up the worker.
+    hashlib releases the GIL while hashing, so other request threads keep running.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_HASH_METHOD
+        self.timeout = 30
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(32)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD)
+        # Computed once so a bad method fails at startup rather than at first login
+        stored_prefix(self.method)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT_SECONDS', 30)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(
+            max_workers=app.config.get('PASSWORD_HASH_WORKERS', 4),
+            thread_name_prefix='password-hasher'
+        )
+        self._slots = threading.BoundedSemaphore(app.config.get('PASSWORD_HASH_QUEUE_LIMIT', 32))
+        app.extensions['password_hasher'] = self
+
+    def _submit(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HasherBusy("Too many password hashes in progress")
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        # The slot is held until the hash finishes, even if the caller stops waiting
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HasherBusy(f"Password hash did not finish within {self.timeout}s")
+
+    def check(self, password_hash, password):
+        return self._submit(check_password_hash, password_hash, password)
+
+    def hash(self, password):
+        return self._submit(generate_password_hash, password, self.method)
+
+    def needs_rehash(self, password_hash):
+        return needs_rehash(password_hash, self.method)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,153 @@
+import bisect
+import os
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from app.models import db
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolStats:
+    """
+    Process-wide counters for the SQLAlchemy connection pool.
+    Each gunicorn worker has its own pool, so these are per worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.observers = []  # callables(name, value), e.g. the Prometheus exporter
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # last bucket is +Inf
+            self.wait_count = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+            self.timeouts = 0
+            self.connects = 0
+            self.checkouts = 0
+            self.invalidations = 0
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+        self._notify('checkout_wait', seconds)
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        self._notify(name, 1)
+
+    def _notify(self, name, value):
+        for observer in self.observers:
+            observer(name, value)
+
+    def histogram(self):
+        """Cumulative bucket counts keyed by upper bound, Prometheus style"""
+        with self._lock:
+            counts = list(self.wait_buckets)
+        result, running = {}, 0
+        for bound, count in zip([*WAIT_BUCKETS, float('inf')], counts):
+            running += count
+            result['+Inf' if bound == float('inf') else str(bound)] = running
+        return result
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.increment('timeouts')
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+def pool_snapshot(engine):
+    """Live pool state plus the counters collected since startup"""
+    pool = engine.pool
+    snapshot = {
+        'pid': os.getpid(),
+        'pool_class': type(pool).__name__,
+    }
+    # Only QueuePool variants expose sizing information
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        snapshot[name] = method() if callable(method) else None
+    snapshot['max_overflow'] = getattr(pool, '_max_overflow', None)
+    snapshot['timeout'] = pool.timeout() if callable(getattr(pool, 'timeout', None)) else None
+    snapshot.update({
+        'connects': pool_stats.connects,
+        'checkouts': pool_stats.checkouts,
+        'invalidations': pool_stats.invalidations,
+        'timeouts': pool_stats.timeouts,
+        'checkout_wait': {
+            'count': pool_stats.wait_count,
+            'sum_seconds': round(pool_stats.wait_sum, 6),
+            'max_seconds': round(pool_stats.wait_max, 6),
+            'buckets': pool_stats.histogram(),
+        },
+    })
+    return snapshot
+
+
+def _on_connect(dbapi_connection, connection_record):
+    pool_stats.increment('connects')
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats.increment('checkouts')
+
+
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    pool_stats.increment('invalidations')
+
+
+POOL_LISTENERS = (
+    ('connect', _on_connect),
+    ('checkout', _on_checkout),
+    ('invalidate', _on_invalidate),
+    ('soft_invalidate', _on_invalidate),
+)
+
+
+class PoolMetrics:
+    """
+    Hooks pool events on the app's engine: new connections, checkouts and
+    invalidated (stale or broken) connections. Checkout waits are timed by
+    InstrumentedQueuePool, selected in Config.SQLALCHEMY_ENGINE_OPTIONS.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['pool_metrics'] = self
+        with app.app_context():
+            engine = db.engine
+        for name, listener in POOL_LISTENERS:
+            if not event.contains(engine, name, listener):
+                event.listen(engine, name, listener)
+
+    def snapshot(self):
+        return pool_snapshot(db.engine)
+
+
+pool_metrics = PoolMetrics()
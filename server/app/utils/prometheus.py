@@ -0,0 +1,169 @@
+import logging
+import os
+import time
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, EmailMessage
+from app.utils.activity_log import activity_writer
+from app.utils.pool_metrics import pool_stats, WAIT_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------
+# Metric definitions
+# -----------------------------
+# With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py) every worker writes
+# its samples to that directory and a scrape of any worker aggregates them all.
+REQUEST_LABELS = ('method', 'blueprint', 'endpoint')
+
+REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests served', REQUEST_LABELS + ('status',)
+)
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time spent serving HTTP requests', REQUEST_LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'HTTP requests currently being served', multiprocess_mode='livesum'
+)
+
+POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out', 'Connections checked out of the pool', multiprocess_mode='livesum'
+)
+POOL_OVERFLOW = Gauge(
+    'db_pool_overflow', 'Overflow connections open beyond pool_size', multiprocess_mode='livesum'
+)
+POOL_SIZE = Gauge(
+    'db_pool_size', 'Configured pool_size', multiprocess_mode='livesum'
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection', buckets=WAIT_BUCKETS
+)
+POOL_EVENTS = Counter(
+    'db_pool_events_total', 'Pool connects, checkouts, invalidations and timeouts', ('event',)
+)
+
+ACTIVITY_QUEUE_DEPTH = Gauge(
+    'activity_log_queue_depth', 'Activity log rows buffered for the background writer', multiprocess_mode='livesum'
+)
+
+
+class QueueDepthCollector:
+    """
+    Email outbox depth, read from the database at scrape time. The outbox is
+    shared by every worker, so it is collected once per scrape, not per process.
+    """
+
+    def collect(self):
+        gauge = GaugeMetricFamily('email_queue_depth', 'Outbound emails by status', labels=['status'])
+        try:
+            counts = dict(
+                db.session.query(EmailMessage.status, db.func.count(EmailMessage.id))
+                .group_by(EmailMessage.status)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            # A database outage must not take the rest of the scrape down with it
+            db.session.rollback()
+            logger.error(f"Failed to read email queue depth: {str(e)}")
+            return
+        for status in ('pending', 'sending', 'failed'):
+            gauge.add_metric([status], counts.get(status, 0))
+        yield gauge
+
+
+def _observe_pool(name, value):
+    if name == 'checkout_wait':
+        POOL_CHECKOUT_WAIT.observe(value)
+    else:
+        POOL_EVENTS.labels(name).inc(value)
+
+
+class PrometheusMetrics:
+    """
+    Request count, latency and in-flight metrics per blueprint/endpoint, plus
+    pool and queue gauges, exposed in the Prometheus text format by /metrics
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['prometheus'] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        if _observe_pool not in pool_stats.observers:
+            pool_stats.observers.append(_observe_pool)
+
+    @staticmethod
+    def multiprocess():
+        return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+    def render(self):
+        """Exposition body and content type for a scrape"""
+        registry = CollectorRegistry()
+        if self.multiprocess():
+            MultiProcessCollector(registry)
+        else:
+            registry.register(_DefaultRegistry())
+        registry.register(QueueDepthCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    def _labels(self):
+        return {
+            'method': request.method,
+            'blueprint': request.blueprint or '',
+            'endpoint': request.endpoint or 'unmatched',
+        }
+
+    def _before_request(self):
+        g._prometheus_start = time.perf_counter()
+        g._prometheus_in_flight = True
+        IN_PROGRESS.inc()
+
+    def _after_request(self, response):
+        self._record(response.status_code)
+        self._update_gauges()
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request does not run when the view raises; Flask answers 500
+        self._record(500)
+        if g.pop('_prometheus_in_flight', False):
+            IN_PROGRESS.dec()
+
+    def _record(self, status):
+        start = g.pop('_prometheus_start', None)
+        if start is None:
+            return
+        labels = self._labels()
+        REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - start)
+        REQUESTS.labels(status=str(status), **labels).inc()
+
+    def _update_gauges(self):
+        # Sampled as each request finishes, while its own connection is still checked out
+        pool = db.engine.pool
+        if callable(getattr(pool, 'checkedout', None)):
+            POOL_CHECKED_OUT.set(pool.checkedout())
+            POOL_OVERFLOW.set(max(pool.overflow(), 0))
+            POOL_SIZE.set(pool.size())
+        ACTIVITY_QUEUE_DEPTH.set(activity_writer.qsize())
+
+
+class _DefaultRegistry:
+    """Adapter so the single-process scrape reuses the global registry"""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+prometheus_metrics = PrometheusMetrics()
@@ -0,0 +1,139 @@
+import json
+import logging
+import threading
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_PREVIEW_CHARS = 200
+
+
+class RequestQueryStats:
+    """SQL statements executed while serving one request"""
+    __slots__ = ('count', 'total', 'slowest')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = []  # (seconds, statement), longest first
+
+    def record(self, statement, seconds, keep):
+        self.count += 1
+        self.total += seconds
+        if len(self.slowest) < keep or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, statement[:STATEMENT_PREVIEW_CHARS]))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[keep:]
+
+
+class QueryStats:
+    """
+    Counts SQL statements and database time per request.
+
+    Requests over SLOW_REQUEST_QUERY_COUNT statements or SLOW_REQUEST_DB_MS of
+    database time are logged as one JSON line with their slowest statements.
+    With QUERY_STATS_HEADERS=true (or =debug, the default, in debug mode) responses carry
+    X-DB-Query-Count and X-DB-Time-Ms. Per-endpoint totals are kept per worker
+    for /metrics/queries. Statements run after the view returns (streamed
+    bodies) are not attributed to the request.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['query_stats'] = self
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        with app.app_context():
+            engine = db.engine
+        if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @property
+    def enabled(self):
+        return self.app.config.get('QUERY_STATS_ENABLED', True)
+
+    def snapshot(self):
+        """Per-endpoint aggregates for this worker, busiest first"""
+        with self._lock:
+            rows = [{'endpoint': endpoint, **dict(totals)} for endpoint, totals in self._endpoints.items()]
+        for row in rows:
+            row['avg_queries'] = round(row['queries'] / row['requests'], 2)
+            row['avg_db_ms'] = round(row['db_ms'] / row['requests'], 3)
+            row['db_ms'] = round(row['db_ms'], 3)
+        return sorted(rows, key=lambda row: row['queries'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def _start(self):
+        if self.enabled:
+            g._query_stats = RequestQueryStats()
+
+    def _finish(self, response):
+        stats = g.pop('_query_stats', None)
+        if stats is None:
+            return response
+        config = self.app.config
+        db_ms = stats.total * 1000
+        endpoint = request.endpoint or request.path
+
+        with self._lock:
+            totals = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'db_ms': 0.0,
+                'max_queries': 0, 'slowest_ms': 0.0, 'slowest_statement': None,
+            })
+            totals['requests'] += 1
+            totals['queries'] += stats.count
+            totals['db_ms'] += db_ms
+            totals['max_queries'] = max(totals['max_queries'], stats.count)
+            if stats.slowest and stats.slowest[0][0] * 1000 > totals['slowest_ms']:
+                totals['slowest_ms'] = round(stats.slowest[0][0] * 1000, 3)
+                totals['slowest_statement'] = stats.slowest[0][1]
+
+        if (stats.count > config.get('SLOW_REQUEST_QUERY_COUNT', 20)
+                or db_ms > config.get('SLOW_REQUEST_DB_MS', 200)):
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': endpoint,
+                'status': response.status_code,
+                'queries': stats.count,
+                'db_ms': round(db_ms, 3),
+                'slowest': [{'ms': round(seconds * 1000, 3), 'sql': sql} for seconds, sql in stats.slowest],
+            }))
+
+        show_headers = config.get('QUERY_STATS_HEADERS', 'debug')
+        if show_headers == 'true' or (show_headers == 'debug' and self.app.debug):
+            response.headers['X-DB-Query-Count'] = str(stats.count)
+            response.headers['X-DB-Time-Ms'] = f"{db_ms:.3f}"
+        return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_query_stats_start', None)
+    if start is None or not has_request_context():
+        return
+    stats = g.get('_query_stats')
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - start, current_app.config.get('QUERY_STATS_TOP_N', 3))
+
+
+query_stats = QueryStats()
@@ -0,0 +1,134 @@
+import threading
+from functools import wraps
+from flask import current_app, make_response, request
+from app.utils.cache import TTLCache
+from app.utils.versions import on_commit
+
+
+class ResponseCache:
+    """
+    Caches successful GET responses of reference-data routes.
+
+    Entries live in a TTL + LRU bounded in-process cache and are tagged with
+    the tables the route reads. After every commit, entries tagged with a
+    table written in that transaction are evicted (see versions.on_commit).
+    Other gunicorn workers learn about the write through the invalidation
+    bus on PostgreSQL; elsewhere their entries age out after
+    RESPONSE_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = TTLCache()
+        self._tags = {}  # table -> keys tagged with it
+        self._generations = {}  # table -> number of evictions so far
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.backend = TTLCache(
+            maxsize=app.config.get('RESPONSE_CACHE_MAX_SIZE', 1024),
+            ttl=app.config.get('RESPONSE_CACHE_TTL_SECONDS', 300)
+        )
+        self.clear()
+        app.extensions['response_cache'] = self
+        on_commit(self.evict_tables)
+
+    @property
+    def enabled(self):
+        return self.app is not None and self.app.config.get('RESPONSE_CACHE_ENABLED', True)
+
+    def get(self, key):
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def generation(self, tables):
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in tables)
+
+    def set(self, key, entry, tables, ttl=None, generation=None):
+        """
+        Store an entry. If any of its tables was evicted since `generation` was
+        read, the response may predate that write and is not stored.
+        """
+        with self._lock:
+            if generation is not None and generation != tuple(self._generations.get(t, 0) for t in tables):
+                return False
+            self.backend.set(key, entry, ttl=ttl)
+            for table in tables:
+                keys = self._tags.setdefault(table, set())
+                keys.add(key)
+                if len(keys) > 2 * self.backend.maxsize:
+                    # Forget keys the LRU already dropped
+                    self._tags[table] = {k for k in keys if self.backend.get(k) is not None}
+        return True
+
+    def evict_tables(self, tables):
+        """Remove every entry tagged with one of these tables"""
+        with self._lock:
+            keys = set()
+            for table in tables:
+                keys |= self._tags.pop(table, set())
+                self._generations[table] = self._generations.get(table, 0) + 1
+            self.evictions += len(keys)
+        for key in keys:
+            self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self._tags.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.backend),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'tags': {table: len(keys) for table, keys in self._tags.items()},
+            }
+
+
+response_cache = ResponseCache()
+
+
+def cached(*tables, ttl=None):
+    """
+    Cache a route's 200 responses per URL, tagged with the tables it reads.
+    Put it below token_required so authentication still runs on every request.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None or not cache.enabled or request.method != 'GET':
+                return f(*args, **kwargs)
+
+            key = f"{request.endpoint}|{request.full_path}"
+            entry = cache.get(key)
+            if entry is not None:
+                body, status, mimetype = entry
+                return current_app.response_class(body, status=status, mimetype=mimetype)
+
+            generation = cache.generation(tables)
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                entry = (response.get_data(), response.status_code, response.mimetype)
+                cache.set(key, entry, tables, ttl=ttl, generation=generation)
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,223 @@
+import base64
+import binascii
+import json
+import re
+from markupsafe import escape
+from datetime import datetime, timezone
+from sqlalchemy import DDL, and_, event, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from app.models import db, Project, ProjectMember
+from app.utils.pagination import InvalidCursor
+
+# Must match the text search configuration of projects.search_vector (migration 8c3f5a1d2e64)
+SEARCH_CONFIG = 'english'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+# ts_headline returns the text unescaped, so it marks matches with sentinels that
+# are swapped for the real tags only after the text has been HTML-escaped
+HEADLINE_START_SENTINEL = '__pxmarkstart__'
+HEADLINE_STOP_SENTINEL = '__pxmarkstop__'
+HEADLINE_OPTIONS = (
+    f"StartSel={HEADLINE_START_SENTINEL}, StopSel={HEADLINE_STOP_SENTINEL}, "
+    "MaxWords=35, MinWords=15, MaxFragments=2"
+)
+
+# Tables built with db.create_all() get the same column and index as the migration
+SEARCH_VECTOR_DDL = (
+    "ALTER TABLE projects ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')) STORED; "
+    "CREATE INDEX ix_projects_search_vector ON projects USING gin (search_vector)"
+)
+event.listen(Project.__table__, 'after_create', DDL(SEARCH_VECTOR_DDL).execute_if(dialect='postgresql'))
+
+
+class InvalidFilter(ValueError):
+    """Raised when a project filter parameter cannot be parsed"""
+
+
+# -----------------------------
+# Filters shared by project listing and search
+# -----------------------------
+def _int_arg(args, name):
+    raw = args.get(name)
+    if raw in (None, ''):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise InvalidFilter(f"{name} must be an integer")
+
+
+def _datetime_arg(args, name):
+    raw = args.get(name)
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise InvalidFilter(f"{name} must be an ISO 8601 date or datetime")
+    # Naive values are taken as UTC, like the stored timestamps
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def project_filter_criteria(args):
+    """
+    WHERE criteria for ?status=&class_id=&cohort_id=&owner_id=&member_of=&created_after=
+    member_of matches projects the user has accepted an invitation to.
+    """
+    criteria = []
+    if args.get('status'):
+        criteria.append(Project.status == args['status'])
+    for name, column in (('class_id', Project.class_id), ('cohort_id', Project.cohort_id), ('owner_id', Project.owner_id)):
+        value = _int_arg(args, name)
+        if value is not None:
+            criteria.append(column == value)
+    member_of = _int_arg(args, 'member_of')
+    if member_of is not None:
+        criteria.append(Project.members.any(
+            and_(ProjectMember.user_id == member_of, ProjectMember.status == 'accepted')
+        ))
+    created_after = _datetime_arg(args, 'created_after')
+    if created_after is not None:
+        criteria.append(Project.created_at > created_after)
+    return criteria
+
+
+# Whitelisted ?sort= keys; prefix with '-' for descending. id breaks ties.
+PROJECT_SORTS = {
+    'id': Project.id,
+    'name': Project.name,
+    'status': Project.status,
+    'created_at': Project.created_at,
+    'updated_at': Project.updated_at,
+}
+
+
+def project_sort_order(raw):
+    """ORDER BY clauses for a ?sort= value such as 'name' or '-created_at'"""
+    raw = (raw or 'id').strip()
+    descending = raw.startswith('-')
+    column = PROJECT_SORTS.get(raw.lstrip('-'))
+    if column is None:
+        raise InvalidFilter(f"Unknown sort: {raw}. Allowed: {', '.join(sorted(PROJECT_SORTS))}")
+    if column is Project.id:
+        return [Project.id.desc() if descending else Project.id]
+    if descending:
+        return [column.desc(), Project.id.desc()]
+    return [column, Project.id]
+
+
+# -----------------------------
+# Ranked search cursor: (rank, id) of the last row
+# -----------------------------
+def encode_search_cursor(rank, row_id):
+    raw = json.dumps([rank, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_search_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        rank, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(rank), int(row_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+# -----------------------------
+# Search
+# -----------------------------
+def search_projects(q, criteria=(), cursor=None, per_page=10):
+    """
+    Projects matching `q`, best match first, with highlighted name and
+    description snippets.
+
+    On PostgreSQL, matches use the GIN-indexed projects.search_vector and are
+    ranked with ts_rank_cd; ts_headline only runs for the rows of the returned
+    page. Paging is keyed on (rank, id), so later pages add a WHERE bound
+    instead of an OFFSET. Other databases fall back to an unranked
+    case-insensitive substring match, newest id first.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        tsquery = func.websearch_to_tsquery(db.cast(SEARCH_CONFIG, REGCONFIG), q)
+        match = literal_column('projects.search_vector', TSVECTOR).op('@@')(tsquery)
+        rank = db.cast(func.ts_rank_cd(literal_column('projects.search_vector', TSVECTOR), tsquery), db.Float)
+    else:
+        patterns = [f"%{_escape_like(term)}%" for term in q.split()]
+        match = and_(*[
+            or_(Project.name.ilike(pattern, escape='\\'), Project.description.ilike(pattern, escape='\\'))
+            for pattern in patterns
+        ])
+        rank = literal(0.0, db.Float)
+
+    page = select(Project.id.label('id'), rank.label('rank')).where(match, *criteria)
+    if cursor:
+        last_rank, last_id = decode_search_cursor(cursor)
+        page = page.where(or_(rank < last_rank, and_(rank == last_rank, Project.id < last_id)))
+    page = page.order_by(rank.desc(), Project.id.desc()).limit(per_page + 1).subquery()
+
+    rows = db.session.execute(
+        select(Project, page.c.rank)
+        .join(page, page.c.id == Project.id)
+        .order_by(page.c.rank.desc(), Project.id.desc())
+    ).all()
+
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last, last_rank = items[-1]
+        next_cursor = encode_search_cursor(last_rank, last.id)
+
+    highlights = _highlights([project for project, _ in items], q)
+    return {
+        'items': [(project, rank, highlights[project.id]) for project, rank in items],
+        'next_cursor': next_cursor,
+        'per_page': per_page,
+    }
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _escape_headline(headline):
+    """HTML-escape a ts_headline result, then turn its sentinels into <mark> tags"""
+    return (
+        str(escape(headline or ''))
+        .replace(HEADLINE_START_SENTINEL, HIGHLIGHT_START)
+        .replace(HEADLINE_STOP_SENTINEL, HIGHLIGHT_STOP)
+    )
+
+
+def _highlights(projects, q):
+    """{project id: {'name': ..., 'description': ...}}: HTML-escaped text with matches wrapped in <mark>"""
+    if not projects:
+        return {}
+    if db.session.get_bind().dialect.name == 'postgresql':
+        tsquery = func.websearch_to_tsquery(db.cast(SEARCH_CONFIG, REGCONFIG), q)
+        config = db.cast(SEARCH_CONFIG, REGCONFIG)
+        rows = db.session.execute(
+            select(
+                Project.id,
+                func.ts_headline(config, Project.name, tsquery, HEADLINE_OPTIONS),
+                func.ts_headline(config, func.coalesce(Project.description, ''), tsquery, HEADLINE_OPTIONS),
+            ).where(Project.id.in_([p.id for p in projects]))
+        ).all()
+        return {
+            row_id: {'name': _escape_headline(name), 'description': _escape_headline(description)}
+            for row_id, name, description in rows
+        }
+
+    pattern = re.compile('|'.join(re.escape(term) for term in q.split()), re.IGNORECASE)
+    def mark(text):
+        # Escape every segment between matches, then wrap the escaped matches
+        text = text or ''
+        parts, last = [], 0
+        for m in pattern.finditer(text):
+            parts.append(str(escape(text[last:m.start()])))
+            parts.append(f"{HIGHLIGHT_START}{escape(m.group(0))}{HIGHLIGHT_STOP}")
+            last = m.end()
+        parts.append(str(escape(text[last:])))
+        return ''.join(parts)
+    return {p.id: {'name': mark(p.name), 'description': mark(p.description)} for p in projects}
@@ -0,0 +1,83 @@
+from sqlalchemy.orm import load_only
+from app.models import db, User, Project, Task, Cohort, Class
+
+
+class InvalidFields(ValueError):
+    """Raised when ?fields= names a field the serializer does not expose"""
+
+
+class Serializer:
+    """
+    Declarative column projection for a model.
+
+    Subclasses list the columns they expose in `fields` and the ones returned
+    when the client does not ask in `default_fields`. Queries built from a
+    serializer select only the requested columns, so unrequested Text columns
+    and secrets such as password_hash are never read from the database.
+    """
+    model = None
+    fields = ()
+    default_fields = None
+
+    @classmethod
+    def parse_fields(cls, raw=None):
+        """Turn a ?fields=a,b value into a tuple of field names"""
+        if not raw:
+            return tuple(cls.default_fields or cls.fields)
+        requested = []
+        for name in (part.strip() for part in raw.split(',')):
+            if name and name not in requested:
+                requested.append(name)
+        unknown = [name for name in requested if name not in cls.fields]
+        if unknown or not requested:
+            raise InvalidFields(
+                f"Unknown field(s) {', '.join(unknown) or '(none)'}; choose from {', '.join(cls.fields)}"
+            )
+        return tuple(requested)
+
+    @classmethod
+    def columns(cls, fields):
+        return [getattr(cls.model, name) for name in fields]
+
+    @classmethod
+    def select(cls, fields):
+        """Core SELECT of just these columns; rows are plain tuples, not ORM objects"""
+        return db.select(*cls.columns(fields))
+
+    @classmethod
+    def load_only(cls, fields):
+        """Loader option for ORM queries that still need entities (the primary key is always loaded)"""
+        return load_only(*cls.columns(fields))
+
+    @classmethod
+    def dump(cls, obj, fields=None):
+        """Serialize an ORM object or a row produced by select()"""
+        return {name: getattr(obj, name) for name in (fields or cls.default_fields or cls.fields)}
+
+
+class UserSerializer(Serializer):
+    model = User
+    fields = ('id', 'name', 'email', 'role', 'cohort_id', 'class_id', 'two_factor_enabled', 'created_at')
+    default_fields = ('id', 'name', 'email', 'role')
+
+
+class ProjectSerializer(Serializer):
+    model = Project
+    fields = ('id', 'name', 'description', 'owner_id', 'class_id', 'cohort_id', 'github_link', 'status',
+              'created_at', 'updated_at')
+    default_fields = ('id', 'name', 'description', 'owner_id', 'github_link', 'status')
+
+
+class TaskSerializer(Serializer):
+    model = Task
+    fields = ('id', 'title', 'description', 'status', 'project_id', 'assignee_id', 'created_at')
+
+
+class CohortSerializer(Serializer):
+    model = Cohort
+    fields = ('id', 'name', 'start_date', 'end_date', 'created_at')
+
+
+class ClassSerializer(Serializer):
+    model = Class
+    fields = ('id', 'name', 'created_at')
@@ -0,0 +1,36 @@
+from flask import current_app
+
+CHUNK_ITEMS = 100
+
+
+def stream_json_array(items, serialize):
+    """
+    Yield a JSON array one chunk at a time so the full result set
+    is never materialized. serialize turns an item into a dict.
+    """
+    dumps = current_app.json.dumps
+    yield '['
+    buffer = []
+    first = True
+    for item in items:
+        buffer.append(dumps(serialize(item)))
+        if len(buffer) >= CHUNK_ITEMS:
+            yield ('' if first else ',') + ','.join(buffer)
+            first = False
+            buffer = []
+    if buffer:
+        yield ('' if first else ',') + ','.join(buffer)
+    yield ']'
+
+
+def stream_ndjson(items, serialize):
+    """Yield newline-delimited JSON, one object per line"""
+    dumps = current_app.json.dumps
+    buffer = []
+    for item in items:
+        buffer.append(dumps(serialize(item)))
+        if len(buffer) >= CHUNK_ITEMS:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
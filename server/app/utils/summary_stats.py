@@ -0,0 +1,219 @@
+import logging
+from collections import Counter
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, event, func, insert, inspect, select, text, update
+from sqlalchemy.orm import Session
+from app.models import db, Project, ProjectStat, Task, TaskStat
+
+logger = logging.getLogger(__name__)
+
+# Columns whose changes move a row between summary buckets
+PROJECT_KEY_COLUMNS = ('cohort_id', 'class_id', 'status')
+TASK_KEY_COLUMNS = ('project_id', 'status')
+
+
+def _project_key(cohort_id, class_id, status):
+    return (cohort_id or 0, class_id or 0, status or '')
+
+
+def _task_key(project_id, status):
+    return None if project_id is None else (project_id, status or '')
+
+
+def _current(model, obj, columns):
+    values = []
+    for name in columns:
+        value = getattr(obj, name)
+        if value is None:
+            # Python-side column defaults are only applied by the INSERT
+            default = model.__table__.c[name].default
+            if default is not None and default.is_scalar:
+                value = default.arg
+        values.append(value)
+    return values
+
+
+def _committed(obj, columns):
+    """Values as last flushed; active_history keeps the old value of a changed column"""
+    attrs = inspect(obj).attrs
+    values = []
+    for name in columns:
+        history = attrs[name].history
+        values.append(history.deleted[0] if history.deleted else getattr(obj, name))
+    return values
+
+
+def _changed(obj, columns):
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in columns)
+
+
+# -----------------------------
+# Session hooks
+# -----------------------------
+def _before_flush(session, flush_context, instances):
+    # Rows being deleted can no longer be loaded once the flush has run
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            _committed(obj, PROJECT_KEY_COLUMNS)
+        elif isinstance(obj, Task):
+            _committed(obj, TASK_KEY_COLUMNS)
+
+
+def _after_flush(session, flush_context):
+    # Computed after the flush so changes the flush itself makes (foreign keys
+    # nulled when a cohort or class is deleted) are counted too
+    projects = Counter()
+    tasks = Counter()
+    deleted_projects = set()
+
+    for obj in session.new:
+        if isinstance(obj, Project):
+            projects[_project_key(*_current(Project, obj, PROJECT_KEY_COLUMNS))] += 1
+        elif isinstance(obj, Task):
+            tasks[_task_key(*_current(Task, obj, TASK_KEY_COLUMNS))] += 1
+
+    for obj in session.dirty:
+        if isinstance(obj, Project) and _changed(obj, PROJECT_KEY_COLUMNS):
+            old = _project_key(*_committed(obj, PROJECT_KEY_COLUMNS))
+            new = _project_key(*_current(Project, obj, PROJECT_KEY_COLUMNS))
+            if old != new:
+                projects[old] -= 1
+                projects[new] += 1
+        elif isinstance(obj, Task) and _changed(obj, TASK_KEY_COLUMNS):
+            old = _task_key(*_committed(obj, TASK_KEY_COLUMNS))
+            new = _task_key(*_current(Task, obj, TASK_KEY_COLUMNS))
+            if old != new:
+                tasks[old] -= 1
+                tasks[new] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Project):
+            projects[_project_key(*_committed(obj, PROJECT_KEY_COLUMNS))] -= 1
+            deleted_projects.add(obj.id)
+        elif isinstance(obj, Task):
+            tasks[_task_key(*_committed(obj, TASK_KEY_COLUMNS))] -= 1
+
+    tasks.pop(None, None)
+    for key in [key for key in tasks if key[0] in deleted_projects]:
+        del tasks[key]
+    if not (any(projects.values()) or any(tasks.values()) or deleted_projects):
+        return
+    connection = session.connection()
+    _apply(connection, ProjectStat, ('cohort_id', 'class_id', 'status'), projects)
+    _apply(connection, TaskStat, ('project_id', 'status'), tasks)
+    if deleted_projects:
+        connection.execute(delete(TaskStat).where(TaskStat.project_id.in_(deleted_projects)))
+
+
+def _apply(connection, model, key_columns, deltas):
+    # Sorted so concurrent writers lock summary rows in the same order
+    rows = [
+        dict(zip(key_columns, key), count=delta)
+        for key, delta in sorted(deltas.items()) if delta
+    ]
+    if not rows:
+        return
+    table = model.__table__
+    dialect = connection.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        stmt = upsert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={'count': table.c['count'] + stmt.excluded['count']}
+        )
+        connection.execute(stmt)
+        return
+
+    for row in rows:
+        match = [table.c[name] == row[name] for name in key_columns]
+        result = connection.execute(update(table).where(*match).values(count=table.c['count'] + row['count']))
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**row))
+
+
+def _track_old_value(target, value, oldvalue, initiator):
+    # No-op; registering it with active_history=True makes the old value available
+    pass
+
+
+# -----------------------------
+# Rebuild from scratch
+# -----------------------------
+def rebuild_summary_tables(session):
+    """Recompute project_stats and task_stats from the source tables; the caller commits"""
+    connection = session.connection()
+    if connection.dialect.name == 'postgresql':
+        # Hold off writers so no delta lands between the delete and the recount
+        connection.execute(text('LOCK TABLE projects, tasks IN SHARE MODE'))
+    connection.execute(delete(ProjectStat))
+    connection.execute(delete(TaskStat))
+
+    cohort_id = func.coalesce(Project.cohort_id, 0)
+    class_id = func.coalesce(Project.class_id, 0)
+    project_status = func.coalesce(Project.status, '')
+    connection.execute(insert(ProjectStat).from_select(
+        ['cohort_id', 'class_id', 'status', 'count'],
+        select(cohort_id, class_id, project_status, func.count()).group_by(cohort_id, class_id, project_status)
+    ))
+    task_status = func.coalesce(Task.status, '')
+    connection.execute(insert(TaskStat).from_select(
+        ['project_id', 'status', 'count'],
+        select(Task.project_id, task_status, func.count())
+        .where(Task.project_id.isnot(None))
+        .group_by(Task.project_id, task_status)
+    ))
+
+
+class SummaryStats:
+    """
+    Keeps project_stats (by cohort, class and status) and task_stats (by
+    project and status) current from Session flush hooks, so dashboard
+    counts are read from a handful of rows instead of scanning projects and
+    tasks. Changes made with bulk UPDATE/DELETE statements or raw SQL bypass
+    the hooks; `flask rebuild-stats` recomputes both tables from scratch.
+    """
+
+    _registered = False
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['summary_stats'] = self
+        self._register_listeners()
+        app.cli.add_command(rebuild_stats_command)
+
+    @classmethod
+    def _register_listeners(cls):
+        if cls._registered:
+            return
+        for model, columns in ((Project, PROJECT_KEY_COLUMNS), (Task, TASK_KEY_COLUMNS)):
+            for name in columns:
+                event.listen(getattr(model, name), 'set', _track_old_value, active_history=True)
+        event.listen(Session, 'before_flush', _before_flush)
+        event.listen(Session, 'after_flush', _after_flush)
+        cls._registered = True
+
+
+@click.command('rebuild-stats')
+@with_appcontext
+def rebuild_stats_command():
+    """Recompute the dashboard summary tables"""
+    rebuild_summary_tables(db.session)
+    db.session.commit()
+    projects = db.session.scalar(select(func.coalesce(func.sum(ProjectStat.count), 0)))
+    tasks = db.session.scalar(select(func.coalesce(func.sum(TaskStat.count), 0)))
+    logger.info(f"Rebuilt summary tables: {projects} projects, {tasks} tasks")
+    click.echo(f"Rebuilt summary tables: {projects} projects, {tasks} tasks")
+
+
+summary_stats = SummaryStats()
@@ -0,0 +1,45 @@
+import os
+import logging
+from jinja2 import Environment, FileSystemLoader
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+class TemplateRegistry:
+    """
+    Loads and compiles the email and page templates once.
+    render() works from the cached compiled Template objects, so no
+    request pays for parsing or compiling Jinja source.
+    """
+
+    def __init__(self, directory=TEMPLATE_DIR):
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=True,
+            auto_reload=False
+        )
+        self._compiled = {}
+
+    def load(self):
+        """Compile every template under the template directory"""
+        for name in self.environment.list_templates(extensions=['html']):
+            self._compiled[name] = self.environment.get_template(name)
+        logger.info(f"Compiled {len(self._compiled)} templates")
+
+    def get(self, name):
+        template = self._compiled.get(name)
+        if template is None:
+            template = self._compiled[name] = self.environment.get_template(name)
+        return template
+
+    def render(self, name, **context):
+        return self.get(name).render(**context)
+
+
+templates = TemplateRegistry()
+
+
+def render(name, **context):
+    """Render a precompiled template, e.g. render('emails/invitation.html', project_name=...)"""
+    return templates.render(name, **context)
@@ -0,0 +1,221 @@
+import atexit
+import hashlib
+import hmac
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select, update
+from app.models import db, TwoFactorCode
+
+logger = logging.getLogger(__name__)
+
+# verify() outcomes
+VALID = 'valid'
+MISSING = 'missing'
+EXPIRED = 'expired'
+INVALID = 'invalid'
+LOCKED = 'locked'
+
+
+def _hash_code(code):
+    return hashlib.sha256(str(code).encode()).hexdigest()
+
+
+def _as_utc(value):
+    # SQLite drops tzinfo; stored values are always UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+# -----------------------------
+# Backends
+# -----------------------------
+class MemoryCodeStore:
+    """
+    Per-process store; only suitable for tests and single-worker development
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def put(self, user_id, code, expires_at):
+        with self._lock:
+            self._codes[user_id] = {'code_hash': _hash_code(code), 'expires_at': expires_at, 'attempts': 0}
+
+    def verify(self, user_id, code, max_attempts):
+        with self._lock:
+            entry = self._codes.get(user_id)
+            if entry is None:
+                return MISSING
+            if datetime.now(timezone.utc) > entry['expires_at']:
+                del self._codes[user_id]
+                return EXPIRED
+            if hmac.compare_digest(entry['code_hash'], _hash_code(code)):
+                del self._codes[user_id]
+                return VALID
+            entry['attempts'] += 1
+            if entry['attempts'] >= max_attempts:
+                del self._codes[user_id]
+                return LOCKED
+            return INVALID
+
+    def sweep(self):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            expired = [user_id for user_id, entry in self._codes.items() if entry['expires_at'] < now]
+            for user_id in expired:
+                del self._codes[user_id]
+        return len(expired)
+
+
+class DatabaseCodeStore:
+    """
+    Stores code hashes in two_factor_codes keyed by user_id, so every
+    gunicorn worker sees the same codes and lookups are a primary-key read
+    """
+
+    def put(self, user_id, code, expires_at):
+        values = {'user_id': user_id, 'code_hash': _hash_code(code), 'expires_at': expires_at, 'attempts': 0}
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            # Upsert so two concurrent logins for one user cannot collide on the primary key
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert as upsert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as upsert
+            stmt = upsert(TwoFactorCode).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id'],
+                set_={name: stmt.excluded[name] for name in ('code_hash', 'expires_at', 'attempts')}
+            )
+            db.session.execute(stmt)
+        else:
+            db.session.merge(TwoFactorCode(**values))
+        db.session.commit()
+
+    def verify(self, user_id, code, max_attempts):
+        now = datetime.now(timezone.utc)
+        # Consume the code in one statement; of two concurrent correct
+        # submissions only the one whose DELETE removed the row succeeds
+        result = db.session.execute(
+            delete(TwoFactorCode)
+            .where(
+                TwoFactorCode.user_id == user_id,
+                TwoFactorCode.code_hash == _hash_code(code),
+                TwoFactorCode.expires_at >= now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return VALID
+
+        expires_at = db.session.scalar(select(TwoFactorCode.expires_at).where(TwoFactorCode.user_id == user_id))
+        if expires_at is None:
+            return MISSING
+
+        if now > _as_utc(expires_at):
+            db.session.execute(
+                delete(TwoFactorCode)
+                .where(TwoFactorCode.user_id == user_id, TwoFactorCode.expires_at < now)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            return EXPIRED
+
+        # Count the attempt atomically so parallel guesses on other workers add up
+        result = db.session.execute(
+            update(TwoFactorCode)
+            .where(TwoFactorCode.user_id == user_id, TwoFactorCode.attempts < max_attempts - 1)
+            .values(attempts=TwoFactorCode.attempts + 1)
+        )
+        if result.rowcount == 0:
+            db.session.execute(delete(TwoFactorCode).where(TwoFactorCode.user_id == user_id))
+            db.session.commit()
+            return LOCKED
+        db.session.commit()
+        return INVALID
+
+    def sweep(self):
+        result = db.session.execute(
+            delete(TwoFactorCode).where(TwoFactorCode.expires_at < datetime.now(timezone.utc))
+        )
+        db.session.commit()
+        return result.rowcount
+
+
+STORES = {
+    'database': DatabaseCodeStore,
+    'memory': MemoryCodeStore,
+}
+
+# -----------------------------
+# Registry used by the auth routes
+# -----------------------------
+class TwoFactorCodes:
+    """
+    Pending 2FA login codes with TTL expiry, attempt counting and a
+    background thread that sweeps expired codes every TWO_FA_SWEEP_INTERVAL_SECONDS.
+    TWO_FA_STORE selects the backend: database (default) or memory.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.store = MemoryCodeStore()
+        self._sweeper = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.store = STORES[app.config.get('TWO_FA_STORE', 'database')]()
+        app.extensions['two_fa_codes'] = self
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    @property
+    def ttl(self):
+        return timedelta(minutes=self.app.config.get('TWO_FA_CODE_TTL_MINUTES', 10))
+
+    def put(self, user_id, code):
+        self._ensure_sweeper()
+        self.store.put(user_id, code, datetime.now(timezone.utc) + self.ttl)
+
+    def verify(self, user_id, code):
+        """Check a code; returns VALID, MISSING, EXPIRED, INVALID or LOCKED"""
+        return self.store.verify(user_id, code, self.app.config.get('TWO_FA_MAX_ATTEMPTS', 5))
+
+    def sweep(self):
+        return self.store.sweep()
+
+    def shutdown(self, timeout=5):
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout)
+            self._sweeper = None
+        self._stop.clear()
+
+    def _ensure_sweeper(self):
+        if self.app.testing or (self._sweeper is not None and self._sweeper.is_alive()):
+            return
+        with self._lock:
+            if self._sweeper is None or not self._sweeper.is_alive():
+                self._sweeper = threading.Thread(target=self._run, name='two-fa-sweeper', daemon=True)
+                self._sweeper.start()
+
+    def _run(self):
+        interval = self.app.config.get('TWO_FA_SWEEP_INTERVAL_SECONDS', 300)
+        while not self._stop.wait(interval):
+            try:
+                with self.app.app_context():
+                    removed = self.sweep()
+                if removed:
+                    logger.info(f"Swept {removed} expired 2FA codes")
+            except Exception as e:
+                logger.error(f"2FA code sweep failed: {str(e)}")
+
+
+two_fa_codes = TwoFactorCodes()
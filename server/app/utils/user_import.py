@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash
+from app.models import db, User, Cohort, Class
+from app.utils.passwords import hash_method
+
+REQUIRED_FIELDS = ('name', 'email', 'password')
+INSERT_BATCH_SIZE = 500
+# Roles an import may assign, keyed case-insensitively
+IMPORT_ROLES = {'student': 'Student', 'admin': 'Admin'}
+# Checked per row so one bad value is reported instead of failing the batch INSERT
+MAX_NAME_LENGTH = User.__table__.c.name.type.length
+MAX_EMAIL_LENGTH = User.__table__.c.email.type.length
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+class ImportFormatError(ValueError):
+    """Raised when the upload cannot be parsed at all"""
+
+
+def parse_rows(body, content_type):
+    """
+    Parse a CSV (header row: name,email,password[,role,cohort_id,class_id])
+    or JSON-lines upload into a list of dicts
+    """
+    text = body.decode('utf-8-sig') if isinstance(body, bytes) else body
+    if 'csv' in content_type:
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+    rows = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise ImportFormatError(f"Line {number} is not valid JSON: {str(e)}") from e
+        if not isinstance(row, dict):
+            raise ImportFormatError(f"Line {number} is not a JSON object")
+        rows.append(row)
+    return rows
+
+
+def hash_passwords(passwords, processes):
+    """Hash passwords across a process pool; processes <= 1 hashes inline"""
+    hasher = partial(generate_password_hash, method=hash_method())
+    if processes <= 1 or len(passwords) < 2:
+        return [hasher(p) for p in passwords]
+
+    chunksize = max(1, len(passwords) // (processes * 4))
+    # spawn avoids forking a worker that already runs background threads
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return list(pool.map(hasher, passwords, chunksize=chunksize))
+
+
+def _optional_int(value):
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+def _email(row):
+    if not isinstance(row, dict):
+        return None
+    return User.normalize_email(row.get('email')) or None
+
+
+def import_users(rows, processes=1):
+    """
+    Validate, hash and insert users; returns one result dict per input row
+    """
+    results = [{'row': i + 1, 'email': _email(row)} for i, row in enumerate(rows)]
+    candidates = []
+    seen = set()
+
+    for result, row in zip(results, rows):
+        if not isinstance(row, dict):
+            result.update(status='error', error='Row must be an object')
+            continue
+        missing = [field for field in REQUIRED_FIELDS if not str(row.get(field) or '').strip()]
+        if missing:
+            result.update(status='error', error=f"Missing {', '.join(missing)}")
+            continue
+        name = str(row['name']).strip()
+        if len(name) > MAX_NAME_LENGTH:
+            result.update(status='error', error=f"Name is longer than {MAX_NAME_LENGTH} characters")
+            continue
+        if len(result['email']) > MAX_EMAIL_LENGTH:
+            result.update(status='error', error=f"Email is longer than {MAX_EMAIL_LENGTH} characters")
+            continue
+        if not EMAIL_PATTERN.match(result['email']):
+            result.update(status='error', error='Invalid email address')
+            continue
+        if result['email'] in seen:
+            result.update(status='error', error='Duplicate email in upload')
+            continue
+        try:
+            cohort_id = _optional_int(row.get('cohort_id'))
+            class_id = _optional_int(row.get('class_id'))
+        except (TypeError, ValueError):
+            result.update(status='error', error='cohort_id and class_id must be integers')
+            continue
+        role = IMPORT_ROLES.get(str(row.get('role') or 'Student').strip().lower())
+        if role is None:
+            result.update(status='error', error=f"Invalid role. Allowed: {', '.join(IMPORT_ROLES.values())}")
+            continue
+        seen.add(result['email'])
+        candidates.append((result, {
+            'name': name,
+            'email': result['email'],
+            'role': role,
+            'cohort_id': cohort_id,
+            'class_id': class_id,
+            'password': str(row['password']),
+        }))
+
+    # One set-based query each for existing emails and referenced cohorts/classes
+    emails = [values['email'] for _, values in candidates]
+    # Emails are compared case-insensitively, also against users created before imports lowercased them
+    existing = set(
+        db.session.scalars(select(func.lower(User.email)).where(func.lower(User.email).in_(emails)))
+    ) if emails else set()
+    cohort_ids = {values['cohort_id'] for _, values in candidates if values['cohort_id']}
+    class_ids = {values['class_id'] for _, values in candidates if values['class_id']}
+    known_cohorts = set(db.session.scalars(select(Cohort.id).where(Cohort.id.in_(cohort_ids)))) if cohort_ids else set()
+    known_classes = set(db.session.scalars(select(Class.id).where(Class.id.in_(class_ids)))) if class_ids else set()
+
+    accepted = []
+    for result, values in candidates:
+        if values['email'] in existing:
+            result.update(status='error', error='Email already registered')
+        elif values['cohort_id'] and values['cohort_id'] not in known_cohorts:
+            result.update(status='error', error='Cohort not found')
+        elif values['class_id'] and values['class_id'] not in known_classes:
+            result.update(status='error', error='Class not found')
+        else:
+            accepted.append((result, values))
+
+    hashes = hash_passwords([values.pop('password') for _, values in accepted], processes)
+    for (_, values), password_hash in zip(accepted, hashes):
+        values['password_hash'] = password_hash
+
+    by_email = {}
+    for start in range(0, len(accepted), INSERT_BATCH_SIZE):
+        chunk = [values for _, values in accepted[start:start + INSERT_BATCH_SIZE]]
+        by_email.update(_insert_users(chunk))
+    db.session.commit()
+
+    for result, values in accepted:
+        if values['email'] in by_email:
+            result.update(status='created', id=by_email[values['email']])
+        else:
+            # Registered by a concurrent import or registration since the check above
+            result.update(status='error', error='Email already registered')
+    return results
+
+
+def _insert_users(chunk):
+    """
+    Insert a batch of users, skipping emails that already exist; returns
+    {email: id} for the rows actually inserted
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        stmt = upsert(User).on_conflict_do_nothing(index_elements=['email']).returning(User.id, User.email)
+        return {email: user_id for user_id, email in db.session.execute(stmt, chunk)}
+
+    # Other dialects: one savepoint per row so a conflict only skips that row
+    inserted = {}
+    for values in chunk:
+        user = User(**values)
+        try:
+            with db.session.begin_nested():
+                db.session.add(user)
+        except IntegrityError:
+            continue
+        inserted[user.email] = user.id
+    return inserted
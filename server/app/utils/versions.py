@@ -0,0 +1,152 @@
+import hashlib
+import logging
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import event, select, update, insert
+from sqlalchemy.orm import Session
+from app.models import db, ResourceVersion
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes bump a version counter
+TRACKED_TABLES = ('users', 'projects', 'classes', 'cohorts', 'project_members', 'tasks')
+
+
+def _bump(connection, tables):
+    # One row per table, always in name order, so concurrent committers
+    # lock the shared rows in the same order and cannot deadlock
+    for table in sorted(t for t in tables if t in TRACKED_TABLES):
+        connection.execute(
+            update(ResourceVersion)
+            .where(ResourceVersion.name == table)
+            .values(version=ResourceVersion.version + 1)
+        )
+
+
+# Callables(tables) run after a commit that wrote to any table, e.g. cache eviction
+_commit_listeners = []
+# Callables(session, tables) run inside the writing transaction, e.g. NOTIFY
+_write_listeners = []
+
+
+def on_commit(listener):
+    """Register listener(tables) to run after each commit, with the names of the tables it wrote"""
+    if listener not in _commit_listeners:
+        _commit_listeners.append(listener)
+    return listener
+
+
+def on_write(listener):
+    """
+    Register listener(session, tables) to run inside the transaction after
+    each flush or bulk statement, so its own SQL commits or rolls back with it
+    """
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+    return listener
+
+
+def _record_written(session, tables):
+    if not tables:
+        return
+    session.info.setdefault('written_tables', set()).update(tables)
+    session.info.setdefault('version_bumps', set()).update(t for t in tables if t in TRACKED_TABLES)
+    for listener in _write_listeners:
+        listener(session, frozenset(tables))
+
+
+def _after_flush(session, flush_context):
+    tables = {obj.__table__.name for obj in (*session.new, *session.dirty, *session.deleted)
+              if hasattr(obj, '__table__')}
+    _record_written(session, tables)
+
+
+def _do_orm_execute(orm_execute_state):
+    # Bulk insert()/update()/delete() statements bypass flush events
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _record_written(orm_execute_state.session, {table.name})
+
+
+def _before_commit(session):
+    # Bump versions once, right before COMMIT, so the shared version rows are
+    # locked only for the commit itself rather than the whole transaction
+    session.flush()
+    tables = session.info.pop('version_bumps', None)
+    if tables:
+        _bump(session.connection(), tables)
+
+
+def _after_rollback(session):
+    session.info.pop('version_bumps', None)
+
+
+def _after_commit(session):
+    # Tables written before a rollback stay in the set, so the next commit
+    # may evict a little more than it wrote; it never evicts less
+    tables = session.info.pop('written_tables', None)
+    if not tables:
+        return
+    for listener in _commit_listeners:
+        try:
+            listener(frozenset(tables))
+        except Exception as e:
+            # The transaction is already committed; never fail the caller
+            logger.error(f"Commit listener {getattr(listener, '__name__', listener)} failed: {str(e)}")
+
+
+def _seed_versions(target, connection, **kw):
+    connection.execute(insert(ResourceVersion), [{'name': name, 'version': 0} for name in TRACKED_TABLES])
+
+
+def get_versions(tables):
+    """Current version of each table; bumped in the same transaction as every write"""
+    rows = db.session.execute(
+        select(ResourceVersion.name, ResourceVersion.version).where(ResourceVersion.name.in_(tables))
+    ).all()
+    versions = dict(rows)
+    return tuple(versions.get(name, 0) for name in tables)
+
+
+_registered = False
+
+
+def register_version_tracking():
+    """Install the session listeners once per process"""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    event.listen(Session, 'before_commit', _before_commit)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    event.listen(ResourceVersion.__table__, 'after_create', _seed_versions)
+    _registered = True
+
+
+def conditional_get(*tables):
+    """
+    Answer GET requests with a weak ETag derived from the request URL and
+    the versions of the tables the response is built from; a matching
+    If-None-Match gets a 304 without running the view
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            versions = get_versions(tables)
+            seed = f"{request.full_path}|{'.'.join(str(v) for v in versions)}"
+            etag = hashlib.sha1(seed.encode()).hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated
+    return decorator
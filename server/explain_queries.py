@@ -0,0 +1,63 @@
+"""
+Runs EXPLAIN on the hot filter paths and checks that each plan uses its index.
+
+Sequential scans are disabled for the session so the check also works on a
+small development database, where the planner would otherwise prefer them.
+
+Usage (PostgreSQL only):
+    python explain_queries.py
+"""
+import sys
+from sqlalchemy import select, text
+from app.models import db, ProjectMember, Task, ActivityLog
+from run import create_app
+
+HOT_QUERIES = [
+    (
+        "invite/remove/respond: member by project and user",
+        select(ProjectMember).filter_by(project_id=1, user_id=1),
+        'uq_project_members_project_user'
+    ),
+    (
+        "get_pending_invitations",
+        select(ProjectMember).filter_by(user_id=1, status='pending'),
+        'ix_project_members_pending_user'
+    ),
+    (
+        "tasks by project",
+        select(Task).filter_by(project_id=1),
+        'ix_tasks_project_id'
+    ),
+    (
+        "tasks by assignee",
+        select(Task).filter_by(assignee_id=1),
+        'ix_tasks_assignee_id'
+    ),
+    (
+        "activity logs newest first",
+        select(ActivityLog).order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(10),
+        'ix_activity_logs_created_at_id'
+    ),
+]
+
+app = create_app()
+
+with app.app_context():
+    if db.engine.dialect.name != 'postgresql':
+        print(f"⚠️ EXPLAIN checks need PostgreSQL (got {db.engine.dialect.name})")
+        sys.exit(2)
+
+    missing = 0
+    with db.engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for label, statement, index_name in HOT_QUERIES:
+            sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            plan = "\n".join(row[0] for row in conn.execute(text(f"EXPLAIN {sql}")))
+            if index_name in plan:
+                print(f"✅ {label}: uses {index_name}")
+            else:
+                missing += 1
+                print(f"❌ {label}: {index_name} not used")
+                print("   " + plan.replace("\n", "\n   "))
+
+    sys.exit(1 if missing else 0)
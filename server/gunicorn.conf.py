@@ -0,0 +1,21 @@
+"""
+Gunicorn settings picked up automatically from the working directory.
+
+Workers share Prometheus metrics through PROMETHEUS_MULTIPROC_DIR: each worker
+writes its samples there and /metrics on any worker aggregates all of them.
+"""
+import os
+import shutil
+
+multiproc_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be summed into the new one
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
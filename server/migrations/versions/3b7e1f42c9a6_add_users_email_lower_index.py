@@ -0,0 +1,24 @@
+"""Add users email lower index
+
+Revision ID: 3b7e1f42c9a6
+Revises: e5a2c9f70b18
+Create Date: 2026-10-17 16:02:18.530417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e1f42c9a6'
+down_revision = 'e5a2c9f70b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_email_lower', table_name='users')
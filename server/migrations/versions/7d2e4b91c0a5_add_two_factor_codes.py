@@ -0,0 +1,34 @@
+"""Add two factor codes
+
+Revision ID: 7d2e4b91c0a5
+Revises: 3c9a1f7e2b44
+Create Date: 2026-10-17 10:03:12.554921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e4b91c0a5'
+down_revision = '3c9a1f7e2b44'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('two_factor_codes',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('code_hash', sa.String(length=64), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_two_factor_codes_expires_at'), 'two_factor_codes', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_two_factor_codes_expires_at'), table_name='two_factor_codes')
+    op.drop_table('two_factor_codes')
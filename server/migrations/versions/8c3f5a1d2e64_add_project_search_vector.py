@@ -0,0 +1,37 @@
+"""Add project search vector
+
+Revision ID: 8c3f5a1d2e64
+Revises: 5be0c2d7a913
+Create Date: 2026-10-17 13:02:47.610385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3f5a1d2e64'
+down_revision = '5be0c2d7a913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated tsvector columns need PostgreSQL 12+; other databases search with LIKE
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        ALTER TABLE projects ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    op.create_index('ix_projects_search_vector', 'projects', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_projects_search_vector', table_name='projects')
+    op.drop_column('projects', 'search_vector')
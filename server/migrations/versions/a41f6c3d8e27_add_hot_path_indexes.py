@@ -0,0 +1,43 @@
+"""Add hot path indexes
+
+Revision ID: a41f6c3d8e27
+Revises: 7d2e4b91c0a5
+Create Date: 2026-10-17 11:20:05.731840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a41f6c3d8e27'
+down_revision = '7d2e4b91c0a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest row of any duplicate invitation so the unique index can be built
+    op.execute("""
+        DELETE FROM project_members a
+        USING project_members b
+        WHERE a.project_id = b.project_id
+          AND a.user_id = b.user_id
+          AND a.id > b.id
+    """)
+    op.create_index('uq_project_members_project_user', 'project_members', ['project_id', 'user_id'], unique=True)
+    op.create_index(
+        'ix_project_members_pending_user', 'project_members', ['user_id'],
+        unique=False, postgresql_where=sa.text("status = 'pending'")
+    )
+    op.create_index('ix_tasks_project_id', 'tasks', ['project_id'], unique=False)
+    op.create_index('ix_tasks_assignee_id', 'tasks', ['assignee_id'], unique=False)
+    op.create_index('ix_activity_logs_created_at_id', 'activity_logs', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_activity_logs_created_at_id', table_name='activity_logs')
+    op.drop_index('ix_tasks_assignee_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id', table_name='tasks')
+    op.drop_index('ix_project_members_pending_user', table_name='project_members')
+    op.drop_index('uq_project_members_project_user', table_name='project_members')
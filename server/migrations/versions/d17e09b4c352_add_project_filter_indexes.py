@@ -0,0 +1,38 @@
+"""Add project filter indexes
+
+Revision ID: d17e09b4c352
+Revises: 8c3f5a1d2e64
+Create Date: 2026-10-17 13:41:09.284116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd17e09b4c352'
+down_revision = '8c3f5a1d2e64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_projects_owner_id', 'projects', ['owner_id'], unique=False)
+    op.create_index('ix_projects_class_id', 'projects', ['class_id'], unique=False)
+    op.create_index('ix_projects_cohort_id', 'projects', ['cohort_id'], unique=False)
+    op.create_index('ix_projects_status_id', 'projects', ['status', 'id'], unique=False)
+    op.create_index('ix_projects_name_id', 'projects', ['name', 'id'], unique=False)
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'], unique=False)
+    op.create_index('ix_projects_updated_at_id', 'projects', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_project_members_user_status', 'project_members', ['user_id', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_project_members_user_status', table_name='project_members')
+    op.drop_index('ix_projects_updated_at_id', table_name='projects')
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
+    op.drop_index('ix_projects_name_id', table_name='projects')
+    op.drop_index('ix_projects_status_id', table_name='projects')
+    op.drop_index('ix_projects_cohort_id', table_name='projects')
+    op.drop_index('ix_projects_class_id', table_name='projects')
+    op.drop_index('ix_projects_owner_id', table_name='projects')
@@ -0,0 +1,51 @@
+"""Add summary tables
+
+Revision ID: e5a2c9f70b18
+Revises: d17e09b4c352
+Create Date: 2026-10-17 14:26:53.907142
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a2c9f70b18'
+down_revision = 'd17e09b4c352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_stats',
+    sa.Column('cohort_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('class_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('cohort_id', 'class_id', 'status')
+    )
+    op.create_table('task_stats',
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('project_id', 'status')
+    )
+    # Backfill; `flask rebuild-stats` runs the same recount later if needed
+    op.execute("""
+        INSERT INTO project_stats (cohort_id, class_id, status, count)
+        SELECT coalesce(cohort_id, 0), coalesce(class_id, 0), coalesce(status, ''), count(*)
+        FROM projects
+        GROUP BY coalesce(cohort_id, 0), coalesce(class_id, 0), coalesce(status, '')
+    """)
+    op.execute("""
+        INSERT INTO task_stats (project_id, status, count)
+        SELECT project_id, coalesce(status, ''), count(*)
+        FROM tasks
+        WHERE project_id IS NOT NULL
+        GROUP BY project_id, coalesce(status, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('task_stats')
+    op.drop_table('project_stats')
@@ -4,6 +4,21 @@ from flask_cors import CORS
 from flasgger import Swagger
 from app.config import Config
 from app.models import db
+from app.utils.activity_log import activity_writer
+from app.utils.email_queue import email_queue
+from app.utils.templates import templates
+from app.utils.auth import principal_cache, token_cache
+from app.utils.two_factor_store import two_fa_codes
+from app.utils.passwords import password_hasher
+from app.utils.versions import register_version_tracking
+from app.utils.compression import compressor
+from app.utils.json_provider import FastJSONProvider
+from app.utils.pool_metrics import pool_metrics
+from app.utils.query_stats import query_stats
+from app.utils.prometheus import prometheus_metrics
+from app.utils.response_cache import response_cache
+from app.utils.invalidation_bus import invalidation_bus
+from app.utils.summary_stats import summary_stats
 
 # Import blueprints
 from app.routes.auth_routes import auth_routes
@@ -14,11 +29,16 @@ from app.routes.member_routes import member_routes
 from app.routes.activity_routes import activity_routes
 from app.routes.task_routes import task_bp  
 from app.routes.class_routes import class_bp
+from app.routes.metrics_routes import metrics_routes
+from app.routes.stats_routes import stats_routes
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # orjson-backed JSON encoding (stdlib fallback); datetimes and model rows serialize natively
+    app.json = FastJSONProvider(app)
+
     # Swagger setup
     Swagger(app)
 
@@ -29,6 +49,49 @@ def create_app():
     db.init_app(app)
     migrate = Migrate(app, db)
 
+    # Connection pool checkout/wait/invalidation counters
+    pool_metrics.init_app(app)
+
+    # Per-request SQL statement counts, DB time and slow-request logging
+    query_stats.init_app(app)
+
+    # Prometheus request/latency/pool/queue metrics served at /metrics
+    prometheus_metrics.init_app(app)
+
+    # Per-table version counters behind ETag / If-None-Match
+    register_version_tracking()
+
+    # Dashboard summary tables kept current on every flush (flask rebuild-stats recomputes them)
+    summary_stats.init_app(app)
+
+    # Background writer for activity logs
+    activity_writer.init_app(app)
+
+    # Outbound email delivery queue
+    email_queue.init_app(app)
+
+    # Compile email and page templates once at startup
+    templates.load()
+
+    # Authenticated user and verified token caches for token_required
+    principal_cache.init_app(app)
+    token_cache.init_app(app)
+
+    # Pending 2FA login codes
+    two_fa_codes.init_app(app)
+
+    # Bounded pool for login-time password hashing
+    password_hasher.init_app(app)
+
+    # Cached reference-data responses, evicted when their tables are committed to
+    response_cache.init_app(app)
+
+    # Cross-worker cache invalidation over Postgres LISTEN/NOTIFY
+    invalidation_bus.init_app(app)
+
+    # gzip/br/deflate response compression
+    compressor.init_app(app)
+
     # Register blueprints
     app.register_blueprint(auth_routes)
     app.register_blueprint(user_routes)
@@ -38,6 +101,8 @@ def create_app():
     app.register_blueprint(activity_routes)
     app.register_blueprint(task_bp)  
     app.register_blueprint(class_bp)
+    app.register_blueprint(metrics_routes)
+    app.register_blueprint(stats_routes)
 
     # Health check endpoint
     @app.route('/health')
@@ -0,0 +1,88 @@
+"""
+Benchmark: bytes on the wire and CPU cost of compressing a GET /projects page.
+
+Seeds an in-memory SQLite database with projects carrying member lists and
+long descriptions, fetches one page uncompressed, then times each encoding
+and compression level on that payload.
+
+Run from the server directory:
+    python -m tests.benchmarks.bench_compression
+"""
+import os
+import time
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from run import create_app  # noqa: E402
+from app.models import db, User, Project, ProjectMember  # noqa: E402
+from app.utils.auth import generate_jwt  # noqa: E402
+from app.utils.compression import compressor, brotli  # noqa: E402
+
+PROJECTS = 100
+MEMBERS_PER_PROJECT = 8
+ROUNDS = 50
+
+
+def seed():
+    users = [User(name=f'Student {i}', email=f'student{i}@example.com', role='Student') for i in range(200)]
+    for user in users:
+        user.password_hash = 'not-used'
+    db.session.add_all(users)
+    db.session.flush()
+
+    for i in range(PROJECTS):
+        project = Project(
+            name=f'Project {i}',
+            # Varied text so the payload does not compress unrealistically well
+            description=' '.join(f'term{(i * 31 + k * 7) % 997}' for k in range(150)),
+            owner_id=users[i % len(users)].id,
+            github_link=f'https://github.com/example/project-{i}',
+        )
+        db.session.add(project)
+        db.session.flush()
+        for j in range(MEMBERS_PER_PROJECT):
+            member = users[(i + j + 1) % len(users)]
+            db.session.add(ProjectMember(project_id=project.id, user_id=member.id, status='accepted'))
+    db.session.commit()
+    return users[0]
+
+
+def measure(fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn()
+    return (time.perf_counter() - start) / ROUNDS, result
+
+
+def main():
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        owner = seed()
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {generate_jwt(owner.id, owner.role)}'}
+        url = f'/projects?per_page={PROJECTS}'
+        payload = client.get(url, headers=headers).data
+
+        cases = [('gzip', level) for level in (1, 6, 9)] + [('deflate', 6)]
+        if brotli is not None:
+            cases += [('br', quality) for quality in (1, 4, 11)]
+
+        print(f"GET {url}: {len(payload):,} bytes uncompressed")
+        print(f"{'encoding':10s} {'level':>5s} {'bytes':>10s} {'saved':>7s} {'cpu (ms)':>9s}")
+        for encoding, level in cases:
+            app.config['COMPRESS_LEVEL'] = app.config['COMPRESS_BROTLI_QUALITY'] = level
+            elapsed, body = measure(lambda: compressor.compress(payload, encoding))
+            saved = 1 - len(body) / len(payload)
+            print(f"{encoding:10s} {level:5d} {len(body):10,d} {saved:7.1%} {elapsed * 1000:9.2f}")
+
+        app.config['COMPRESS_LEVEL'] = 6
+        identity, _ = measure(lambda: client.get(url, headers={**headers, 'Accept-Encoding': 'identity'}))
+        gzipped, _ = measure(lambda: client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'}))
+        print(f"end-to-end request: identity {identity * 1000:.2f} ms, gzip {gzipped * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
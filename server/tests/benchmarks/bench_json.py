@@ -0,0 +1,84 @@
+"""
+Benchmark: serialization cost of list_projects and get_tasks payloads with
+Flask's stdlib JSON provider versus FastJSONProvider (orjson when installed).
+
+The "stdlib" column converts datetimes with .isoformat() by hand, as the routes
+used to; the fast provider receives raw datetime objects.
+
+Run from the server directory:
+    python -m tests.benchmarks.bench_json
+"""
+import os
+import time
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from run import create_app  # noqa: E402
+from app.models import db, User, Project, ProjectMember, Task  # noqa: E402
+from app.routes.task_routes import task_to_dict  # noqa: E402
+from app.utils.auth import generate_jwt  # noqa: E402
+from app.utils.json_provider import FastJSONProvider, orjson  # noqa: E402
+
+PROJECTS = 100
+TASKS = 5000
+ROUNDS = 20
+
+
+def seed():
+    users = [User(name=f'Student {i}', email=f'student{i}@example.com', role='Student') for i in range(200)]
+    for user in users:
+        user.password_hash = 'not-used'
+    db.session.add_all(users)
+    db.session.flush()
+    for i in range(PROJECTS):
+        project = Project(name=f'Project {i}', description=f'Description of project {i}. ' * 10, owner_id=users[i].id)
+        db.session.add(project)
+        db.session.flush()
+        for j in range(8):
+            db.session.add(ProjectMember(project_id=project.id, user_id=users[(i + j + 1) % 200].id, status='accepted'))
+        db.session.add_all([
+            Task(title=f'Task {i}-{k}', description='Implement and test', project_id=project.id, assignee_id=users[k].id)
+            for k in range(TASKS // PROJECTS)
+        ])
+    db.session.commit()
+    return users[0]
+
+
+def measure(dumps, payload):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        dumps(payload)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        owner = seed()
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {generate_jwt(owner.id, owner.role)}'}
+        projects = client.get(f'/projects?per_page={PROJECTS}', headers=headers).json
+
+        tasks = db.session.execute(db.select(Task).order_by(Task.id)).scalars().all()
+        tasks_native = [task_to_dict(t) for t in tasks]
+        tasks_manual = [{**row, 'created_at': row['created_at'].isoformat()} for row in tasks_native]
+
+        stdlib = DefaultJSONProvider(app)
+        fast = FastJSONProvider(app)
+        print(f"fast provider backend: {'orjson' if orjson is not None else 'stdlib (orjson not installed)'}")
+        print(f"{'payload':28s} {'stdlib (ms)':>12s} {'fast (ms)':>10s} {'speedup':>8s}")
+        for name, before_payload, after_payload in [
+            (f'list_projects x{PROJECTS}', projects, projects),
+            (f'get_tasks x{len(tasks)}', tasks_manual, tasks_native),
+        ]:
+            before = measure(stdlib.dumps, before_payload)
+            after = measure(fast.dumps, after_payload)
+            print(f"{name:28s} {before:12.2f} {after:10.2f} {before / after:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Micro-benchmark: per-render cost of the invitation pages and emails.
+
+"before" re-parses and compiles the template source on every call, the way
+render_template_string on an inline literal did; "after" renders the cached
+compiled template from app.utils.templates.
+
+Run from the server directory:
+    python -m tests.benchmarks.bench_templates
+"""
+import timeit
+from flask import Flask, render_template_string
+from app.utils.templates import templates
+
+ROUNDS = 2000
+
+CASES = [
+    ('pages/invitation_accepted.html', {'project_name': 'Project X', 'frontend_url': 'http://127.0.0.1:5173'}),
+    ('pages/invitation_not_found.html', {}),
+    ('emails/invitation.html', {'project_name': 'Project X', 'inviter_name': 'Admin User'}),
+    ('emails/two_factor_code.html', {'code': '123456', 'user_name': 'Student 1', 'ttl_minutes': 10}),
+]
+
+
+def main():
+    app = Flask(__name__)
+    templates.load()
+
+    print(f"{'template':38s} {'before (us)':>12s} {'after (us)':>12s} {'speedup':>8s}")
+    with app.app_context():
+        for name, context in CASES:
+            source = templates.environment.loader.get_source(templates.environment, name)[0]
+            before = timeit.timeit(lambda: render_template_string(source, **context), number=ROUNDS)
+            after = timeit.timeit(lambda: templates.render(name, **context), number=ROUNDS)
+            print(f"{name:38s} {before / ROUNDS * 1e6:12.1f} {after / ROUNDS * 1e6:12.1f} {before / after:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
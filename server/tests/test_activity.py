@@ -64,3 +64,74 @@ def test_list_activities_non_admin_denied(client, app):
     res = client.get('/activities/activities', headers=headers)
     assert res.status_code == 403
     assert res.json['message'] == 'You are not authorized to access this resource.'
+
+# -----------------------------
+# Test: Admin can walk activities with a keyset cursor
+# -----------------------------
+def test_list_activities_cursor_pagination(client, app):
+    token = get_admin_token(client, app)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with app.app_context():
+        admin_user = db.session.execute(
+            db.select(User).filter_by(email='admin@test.com')
+        ).scalar_one()
+        base = datetime.now(timezone.utc)
+        for i in range(5):
+            db.session.add(ActivityLog(
+                user_id=admin_user.id,
+                action=f"Cursor activity {i}",
+                created_at=base - timedelta(minutes=i)
+            ))
+        db.session.commit()
+        expected = [
+            a.id for a in ActivityLog.query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+        ]
+
+    seen = []
+    cursor = ''
+    while True:
+        res = client.get(f'/activities/activities?per_page=2&cursor={cursor}', headers=headers)
+        assert res.status_code == 200
+        data = res.json
+        assert data['total_items'] is None
+        seen.extend(a['id'] for a in data['items'])
+        if not data['next_cursor']:
+            break
+        cursor = data['next_cursor']
+
+    assert seen == expected
+
+    res = client.get('/activities/activities?cursor=&include_total=true', headers=headers)
+    assert res.json['total_items'] == len(expected)
+
+    res = client.get('/activities/activities?cursor=not-a-cursor', headers=headers)
+    assert res.status_code == 400
+
+# -----------------------------
+# Test: Background writer batches rows and drains on shutdown
+# -----------------------------
+def test_activity_writer_batches_and_drains(app):
+    from app.utils.activity_log import ActivityLogWriter
+
+    with app.app_context():
+        admin_user = db.session.execute(
+            db.select(User).filter_by(email='admin@test.com')
+        ).scalar_one()
+        admin_id = admin_user.id
+        before = ActivityLog.query.count()
+
+    writer = ActivityLogWriter(app)
+    writer.batch_size = 3
+    for i in range(7):
+        assert writer.enqueue({
+            'user_id': admin_id,
+            'action': f"Batched activity {i}",
+            'created_at': datetime.now(timezone.utc)
+        })
+    writer.shutdown()
+
+    with app.app_context():
+        db.session.expire_all()
+        assert ActivityLog.query.count() == before + 7
+        assert ActivityLog.query.filter(ActivityLog.action.like('Batched activity %')).count() == 7
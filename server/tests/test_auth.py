@@ -27,3 +27,248 @@ def test_register_new_user(client):
     # Login should succeed since there's no verification step now
     res = client.post('/auth/login', json={'email': email, 'password': password})
     assert res.status_code == 200
+
+def test_emails_match_case_insensitively(client):
+    # Stored lowercased, like bulk-imported users
+    res = client.post('/auth/register', json={'name': 'Mixed', 'email': ' Mixed.Case@Test.com ', 'password': 'pw'})
+    assert res.status_code == 201
+    assert User.query.filter_by(email='mixed.case@test.com').one().name == 'Mixed'
+
+    res = client.post('/auth/login', json={'email': 'MIXED.case@test.com', 'password': 'pw'})
+    assert res.status_code == 200
+
+    res = client.post('/auth/register', json={'name': 'Variant', 'email': 'MIXED.CASE@TEST.COM', 'password': 'pw'})
+    assert res.status_code == 400
+
+    # Accounts stored with mixed case before emails were normalized still log in
+    legacy = User(name='Legacy', email='Legacy.User@Test.com')
+    legacy.set_password('pw')
+    db.session.add(legacy)
+    db.session.commit()
+    res = client.post('/auth/login', json={'email': 'legacy.user@test.com', 'password': 'pw'})
+    assert res.status_code == 200
+
+def test_verified_token_cache_expires_with_token():
+    import time
+    import jwt
+    from datetime import datetime, timedelta, timezone
+    from app.utils.auth import VerifiedTokenCache
+
+    secret = 'test-secret-key-for-token-cache'
+    cache = VerifiedTokenCache()
+    token = jwt.encode(
+        {'user_id': 1, 'exp': datetime.now(timezone.utc) + timedelta(seconds=1)},
+        secret,
+        algorithm='HS256'
+    )
+
+    assert cache.decode(token, secret)['user_id'] == 1
+    assert len(cache.cache) == 1
+
+    # A tampered token has a different digest and still goes through verification
+    with pytest.raises(jwt.InvalidTokenError):
+        cache.decode(token[:-2] + ('AA' if not token.endswith('AA') else 'BB'), secret)
+
+    time.sleep(1.1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        cache.decode(token, secret)
+    assert len(cache.cache) == 0
+
+def login_with_2fa(client, app, email, password):
+    import re
+    from app.utils.email_queue import MemoryTransport
+
+    transport = MemoryTransport()
+    app.extensions['email_queue'].transport = transport
+    res = client.post('/auth/login', json={'email': email, 'password': password})
+    assert res.status_code == 200
+    code = re.search(r'>(\d{6})</h2>', transport.outbox[-1]['html']).group(1)
+    return res.json['user_id'], code
+
+def test_two_factor_login_flow(client, app):
+    user = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    user.two_factor_enabled = True
+    db.session.commit()
+
+    user_id, code = login_with_2fa(client, app, 'student1@example.com', 'studentpass')
+    wrong = '000000' if code != '000000' else '111111'
+
+    res = client.post('/auth/verify-2fa', json={'user_id': user_id, 'code': wrong})
+    assert res.status_code == 401
+
+    res = client.post('/auth/verify-2fa', json={'user_id': user_id, 'code': code})
+    assert res.status_code == 200
+    assert 'token' in res.json
+
+    # Codes are single use
+    res = client.post('/auth/verify-2fa', json={'user_id': user_id, 'code': code})
+    assert res.status_code == 400
+
+    # Too many wrong guesses invalidate the code
+    user_id, code = login_with_2fa(client, app, 'student1@example.com', 'studentpass')
+    wrong = '000000' if code != '000000' else '111111'
+    statuses = [
+        client.post('/auth/verify-2fa', json={'user_id': user_id, 'code': wrong}).status_code
+        for _ in range(app.config['TWO_FA_MAX_ATTEMPTS'])
+    ]
+    assert statuses[-1] == 429
+    res = client.post('/auth/verify-2fa', json={'user_id': user_id, 'code': code})
+    assert res.status_code == 400
+
+def test_two_factor_fallback_logs_configured_ttl(client, app, monkeypatch, caplog):
+    from app.routes import auth_routes
+    user = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    user.two_factor_enabled = True
+    db.session.commit()
+    app.config['TWO_FA_CODE_TTL_MINUTES'] = 4
+
+    def failing_send(*args, **kwargs):
+        raise RuntimeError('queue unavailable')
+    monkeypatch.setattr(auth_routes, 'send_2fa_code_email', failing_send)
+
+    with caplog.at_level('WARNING', logger='app.routes.auth_routes'):
+        res = client.post('/auth/login', json={'email': 'student1@example.com', 'password': 'studentpass'})
+    assert res.status_code == 200
+    assert 'This code will expire in 4 minutes' in caplog.text
+
+@pytest.mark.parametrize('store_name', ['memory', 'database'])
+def test_two_factor_store_expiry_and_sweep(app, store_name):
+    from datetime import datetime, timedelta, timezone
+    from app.utils.two_factor_store import STORES, VALID, EXPIRED, MISSING
+
+    store = STORES[store_name]()
+    user = db.session.execute(db.select(User).filter_by(email='student2@example.com')).scalar_one()
+    other = db.session.execute(db.select(User).filter_by(email='student3@example.com')).scalar_one()
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    future = datetime.now(timezone.utc) + timedelta(minutes=10)
+
+    store.put(user.id, '123456', past)
+    assert store.verify(user.id, '123456', 5) == EXPIRED
+    assert store.verify(user.id, '123456', 5) == MISSING
+
+    store.put(user.id, '123456', past)
+    store.put(other.id, '654321', future)
+    assert store.sweep() == 1
+    assert store.verify(other.id, '654321', 5) == VALID
+
+def test_database_code_store_is_race_safe(app):
+    from datetime import datetime, timedelta, timezone
+    from app.utils.two_factor_store import DatabaseCodeStore, VALID, MISSING, INVALID
+    from app.models import TwoFactorCode
+
+    store = DatabaseCodeStore()
+    user = db.session.execute(db.select(User).filter_by(email='student2@example.com')).scalar_one()
+    future = datetime.now(timezone.utc) + timedelta(minutes=10)
+
+    # A second login replaces the pending code in place
+    store.put(user.id, '111111', future)
+    store.put(user.id, '222222', future)
+    assert db.session.query(TwoFactorCode).filter_by(user_id=user.id).count() == 1
+    assert store.verify(user.id, '111111', 5) == INVALID
+
+    # The code is consumed by a single DELETE: a second, late correct submission
+    # (the loser of a race) gets MISSING instead of an error
+    assert store.verify(user.id, '222222', 5) == VALID
+    assert store.verify(user.id, '222222', 5) == MISSING
+
+def test_outdated_password_hash_upgraded_on_login(client, app):
+    from werkzeug.security import generate_password_hash
+
+    user = User(name='Legacy User', email='legacy@test.com', role='Student')
+    user.password_hash = generate_password_hash('legacypass', method='pbkdf2:sha256:1000')
+    db.session.add(user)
+    db.session.commit()
+    assert user.password_needs_rehash()
+
+    res = client.post('/auth/login', json={'email': 'legacy@test.com', 'password': 'legacypass'})
+    assert res.status_code == 200
+
+    db.session.refresh(user)
+    assert user.password_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+    assert not user.password_needs_rehash()
+    assert user.check_password('legacypass')
+
+def test_short_hash_method_does_not_rehash_every_login(client, app):
+    from app.utils.passwords import needs_rehash
+
+    password_hasher = app.extensions['password_hasher']
+    saved = password_hasher.method
+    app.config['PASSWORD_HASH_METHOD'] = password_hasher.method = 'scrypt'
+    try:
+        user = User(name='Short Method', email='short@test.com', role='Student')
+        user.set_password('shortpass')
+        db.session.add(user)
+        db.session.commit()
+        # Werkzeug stores the expanded method
+        assert user.password_hash.startswith('scrypt:32768:8:1$')
+        assert not user.password_needs_rehash()
+        assert not needs_rehash(user.password_hash, 'scrypt')
+        stored = user.password_hash
+
+        res = client.post('/auth/login', json={'email': 'short@test.com', 'password': 'shortpass'})
+        assert res.status_code == 200
+        db.session.refresh(user)
+        assert user.password_hash == stored
+    finally:
+        app.config['PASSWORD_HASH_METHOD'] = password_hasher.method = saved
+
+def test_login_rejected_when_hasher_saturated(client, app):
+    import threading
+    password_hasher = app.extensions['password_hasher']
+    saved = password_hasher._slots
+    password_hasher._slots = threading.BoundedSemaphore(1)
+    password_hasher._slots.acquire()
+    try:
+        res = client.post('/auth/login', json={'email': 'admin@test.com', 'password': 'adminpass'})
+        assert res.status_code == 503
+    finally:
+        password_hasher._slots = saved
+
+def test_hasher_timeout_maps_to_busy_and_keeps_slot(app):
+    import threading
+    import pytest
+    from app.utils.passwords import HasherBusy
+
+    password_hasher = app.extensions['password_hasher']
+    saved = password_hasher._slots, password_hasher.timeout
+    password_hasher._slots = threading.BoundedSemaphore(1)
+    password_hasher.timeout = 0.01
+    release = threading.Event()
+    try:
+        with pytest.raises(HasherBusy):
+            password_hasher._submit(release.wait, 5)
+        # The timed-out hash is still running, so its slot is still taken
+        with pytest.raises(HasherBusy):
+            password_hasher._submit(lambda: None)
+        release.set()
+        password_hasher.timeout = 5
+        for _ in range(100):
+            if password_hasher._slots.acquire(blocking=False):
+                password_hasher._slots.release()
+                break
+            threading.Event().wait(0.01)
+        assert password_hasher._submit(lambda: 'done') == 'done'
+    finally:
+        release.set()
+        password_hasher._slots, password_hasher.timeout = saved
+
+def test_busy_hasher_does_not_block_verified_login(client, app):
+    from werkzeug.security import generate_password_hash
+    from app.utils.passwords import HasherBusy
+
+    user = User(name='Busy Upgrade', email='busy@test.com', role='Student')
+    user.password_hash = generate_password_hash('busypass', method='pbkdf2:sha256:1000')
+    db.session.add(user)
+    db.session.commit()
+
+    password_hasher = app.extensions['password_hasher']
+    def busy(password):
+        raise HasherBusy("saturated")
+    password_hasher.hash = busy
+    try:
+        res = client.post('/auth/login', json={'email': 'busy@test.com', 'password': 'busypass'})
+        assert res.status_code == 200
+    finally:
+        del password_hasher.hash
+    db.session.refresh(user)
+    assert user.password_needs_rehash()
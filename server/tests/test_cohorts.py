@@ -1,4 +1,5 @@
 import pytest
+from datetime import date
 from app.models import Cohort, db
 
 def test_cohort_crud(client, app):
@@ -39,3 +40,22 @@ def test_cohort_crud(client, app):
     res = client.get('/cohorts/', headers=headers)
     cohorts_list = res.json.get('items', [res.json]) if isinstance(res.json, dict) else res.json
     assert all(c['id'] != cohort_id for c in cohorts_list)
+
+def test_list_cohorts_sparse_fieldsets(client):
+    db.session.add_all([Cohort(name=f'Sparse {i}', start_date=date(2025, 1, i + 1)) for i in range(3)])
+    db.session.commit()
+    login = client.post('/auth/login', json={'email': 'admin@test.com', 'password': 'adminpass'})
+    headers = {'Authorization': f"Bearer {login.json['token']}"}
+
+    res = client.get('/cohorts/', headers=headers)
+    assert set(res.json['items'][0]) == {'id', 'name', 'start_date', 'end_date', 'created_at'}
+    assert {c['start_date'] for c in res.json['items']} == {'2025-01-01', '2025-01-02', '2025-01-03'}
+
+    # Keyset paging still works when created_at is not requested
+    res = client.get('/cohorts/?fields=id,name&per_page=2&cursor=', headers=headers)
+    assert res.status_code == 200
+    assert all(set(c) == {'id', 'name'} for c in res.json['items'])
+    next_page = client.get(f"/cohorts/?fields=id,name&per_page=2&cursor={res.json['next_cursor']}", headers=headers)
+    assert [c['name'] for c in res.json['items'] + next_page.json['items']] == ['Sparse 2', 'Sparse 1', 'Sparse 0']
+
+    assert client.get('/cohorts/?fields=description', headers=headers).status_code == 400
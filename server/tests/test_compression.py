@@ -0,0 +1,73 @@
+# tests/test_compression.py
+import gzip
+import json
+import zlib
+import pytest
+from app.models import db, Class, Project, Task, User
+
+@pytest.fixture
+def many_classes(app):
+    """Enough classes for /classes/ to cross the compression threshold."""
+    db.session.add_all([Class(name=f'Compression Class {i}') for i in range(50)])
+    db.session.commit()
+
+# -----------------------------
+# Test: buffered JSON is gzipped when large enough
+# -----------------------------
+def test_large_response_is_gzipped(client, many_classes):
+    plain = client.get('/classes/')
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    res = client.get('/classes/', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert res.status_code == 200
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in res.headers['Vary']
+    assert int(res.headers['Content-Length']) == len(res.data) < len(plain.data)
+    assert json.loads(gzip.decompress(res.data)) == plain.json
+    assert res.headers['ETag'].startswith('W/')
+
+# -----------------------------
+# Test: negotiation honours q-values
+# -----------------------------
+def test_encoding_negotiation(client, many_classes):
+    res = client.get('/classes/', headers={'Accept-Encoding': 'gzip;q=0, deflate'})
+    assert res.headers['Content-Encoding'] == 'deflate'
+    assert len(json.loads(zlib.decompress(res.data))) == 50
+
+    res = client.get('/classes/', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in res.headers
+
+# -----------------------------
+# Test: small and empty responses are left alone
+# -----------------------------
+def test_small_and_not_modified_responses_are_not_compressed(client, many_classes):
+    res = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in res.headers
+    assert res.json == {'status': 'ok'}
+
+    etag = client.get('/classes/').headers['ETag']
+    res = client.get('/classes/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert res.status_code == 304
+    assert 'Content-Encoding' not in res.headers
+
+# -----------------------------
+# Test: streamed responses are compressed chunk by chunk
+# -----------------------------
+def test_streamed_response_is_compressed(client, app):
+    student = User.query.filter_by(email='student1@example.com').first()
+    project = Project(name='Compressed Stream', owner_id=student.id)
+    db.session.add(project)
+    db.session.commit()
+    db.session.add_all([Task(title=f'Task {i}', project_id=project.id) for i in range(250)])
+    db.session.commit()
+
+    plain = client.get('/tasks/')
+    res = client.get('/tasks/', headers={'Accept-Encoding': 'gzip'})
+    assert res.is_streamed
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in res.headers
+    assert json.loads(gzip.decompress(res.data)) == plain.json
+
+    app.config['COMPRESS_ENABLED'] = False
+    assert 'Content-Encoding' not in client.get('/tasks/', headers={'Accept-Encoding': 'gzip'}).headers
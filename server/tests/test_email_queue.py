@@ -0,0 +1,97 @@
+import time
+import pytest
+from app.models import db, EmailMessage
+from app.utils.email_queue import EmailQueue, MemoryTransport
+from app.utils.email_utils import send_invitation_email, send_2fa_code_email
+
+@pytest.fixture
+def memory_transport(app):
+    transport = MemoryTransport()
+    app.extensions['email_queue'].transport = transport
+    return transport
+
+def test_enqueue_delivers_inline_when_testing(app, memory_transport):
+    message = send_invitation_email('student1@example.com', 'Queue Project', 'Admin User')
+
+    assert message.status == 'sent'
+    assert message.attempts == 1
+    assert memory_transport.outbox[0]['to'] == 'student1@example.com'
+    assert 'Queue Project' in memory_transport.outbox[0]['html']
+
+def test_failed_delivery_is_retried_with_backoff(app, memory_transport):
+    app.config['EMAIL_MAX_ATTEMPTS'] = 2
+    memory_transport.fail_with = RuntimeError('sink unavailable')
+
+    message = send_2fa_code_email('student1@example.com', '123456', 'Student 1')
+    assert message.status == 'pending'
+    assert message.attempts == 1
+    assert message.last_error == 'sink unavailable'
+    assert message.next_attempt_at > message.created_at
+
+    # Make it due again and let a worker pass pick it up
+    message.next_attempt_at = message.created_at
+    db.session.commit()
+    app.extensions['email_queue'].process_due()
+    db.session.refresh(message)
+    assert message.status == 'failed'
+    assert message.attempts == 2
+
+def test_worker_pool_delivers_queued_messages(app):
+    transport = MemoryTransport()
+    queue = EmailQueue(app)
+    queue.transport = transport
+    app.config.update({'EMAIL_QUEUE_SYNC': False, 'EMAIL_WORKERS': 2, 'EMAIL_POLL_INTERVAL_SECONDS': 0.1})
+    app.testing = False
+    try:
+        for i in range(3):
+            queue.enqueue('invitation', f'worker{i}@example.com', 'Subject', '<p>Hi</p>')
+
+        deadline = time.monotonic() + 5
+        while len(transport.outbox) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        queue.shutdown()
+        app.testing = True
+
+    assert sorted(m['to'] for m in transport.outbox) == ['worker0@example.com', 'worker1@example.com', 'worker2@example.com']
+    db.session.expire_all()
+    assert db.session.query(EmailMessage).filter_by(status='sent').count() == 3
+
+def test_bodies_cleared_once_finished(app, memory_transport):
+    message = send_2fa_code_email('student1@example.com', '482913', 'Student 1')
+    assert '482913' in memory_transport.outbox[0]['html']
+    db.session.refresh(message)
+    assert message.status == 'sent'
+    assert message.html_body == ''
+
+    app.config['EMAIL_MAX_ATTEMPTS'] = 1
+    memory_transport.fail_with = RuntimeError('sink unavailable')
+    failed = send_2fa_code_email('student1@example.com', '771204', 'Student 1')
+    db.session.refresh(failed)
+    assert failed.status == 'failed'
+    assert failed.html_body == ''
+
+def test_purge_finished_removes_old_rows(app, memory_transport):
+    from datetime import datetime, timedelta, timezone
+
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    queue = app.extensions['email_queue']
+    sent = queue.enqueue('invitation', 'old@example.com', 'Old', '<p>old</p>')
+    sent.created_at = old
+    pending = EmailMessage(kind='invitation', to_email='later@example.com', subject='Later',
+                           html_body='<p>later</p>', created_at=old)
+    db.session.add(pending)
+    recent = queue.enqueue('invitation', 'new@example.com', 'New', '<p>new</p>')
+    db.session.commit()
+
+    assert queue.purge_finished() == 1
+    remaining = {m.to_email for m in db.session.query(EmailMessage).all()}
+    assert remaining == {'later@example.com', 'new@example.com'}
+    assert recent.status == 'sent'
+
+def test_2fa_email_states_configured_ttl(app, memory_transport):
+    app.config['TWO_FA_CODE_TTL_MINUTES'] = 3
+    send_2fa_code_email('student1@example.com', '604113', 'Student 1')
+    html = memory_transport.outbox[-1]['html']
+    assert '604113' in html
+    assert 'expire in 3 minutes' in html
@@ -0,0 +1,66 @@
+# tests/test_invalidation_bus.py
+import json
+import os
+from sqlalchemy import event
+from app.models import db, Class
+from app.utils.auth import principal_cache
+from app.utils.invalidation_bus import invalidation_bus
+from app.utils.response_cache import response_cache
+
+def notification(tables, pid=None):
+    return json.dumps({'pid': os.getpid() + 1 if pid is None else pid, 'tables': tables})
+
+# -----------------------------
+# Test: a notification from another worker evicts tagged entries
+# -----------------------------
+def test_handle_evicts_response_cache(client):
+    client.get('/classes/')
+    assert response_cache.stats()['tags'].get('classes') == 1
+
+    invalidation_bus.handle(notification(['cohorts']))
+    assert response_cache.stats()['entries'] == 1
+
+    invalidation_bus.handle(notification(['classes']))
+    assert response_cache.stats()['entries'] == 0
+    assert 'classes' not in response_cache.stats()['tags']
+
+# -----------------------------
+# Test: user writes clear the local principal cache
+# -----------------------------
+def test_handle_users_clears_principals():
+    principal_cache.backend.set('1', {'id': 1})
+    invalidation_bus.handle(notification(['projects']))
+    assert principal_cache.backend.get('1') is not None
+
+    invalidation_bus.handle(notification(['users']))
+    assert principal_cache.backend.get('1') is None
+
+# -----------------------------
+# Test: own and malformed notifications are ignored
+# -----------------------------
+def test_handle_ignores_own_and_malformed_payloads(client):
+    client.get('/classes/')
+    received = invalidation_bus.received
+
+    invalidation_bus.handle(notification(['classes'], pid=os.getpid()))
+    invalidation_bus.handle('not json')
+    assert response_cache.stats()['entries'] == 1
+    assert invalidation_bus.received == received
+
+# -----------------------------
+# Test: the bus stays inactive off PostgreSQL
+# -----------------------------
+def test_no_notify_outside_postgres(client):
+    assert not invalidation_bus.is_active()
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        db.session.add(Class(name='Quiet Class'))
+        db.session.commit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert statements
+    assert not any('pg_notify' in s for s in statements)
@@ -0,0 +1,64 @@
+# tests/test_json_provider.py
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from app.models import db, User, Class
+from app.utils import json_provider
+
+MOMENT = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def provider(request, app, monkeypatch):
+    """Run each test on the accelerated path and on the stdlib fallback."""
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip('orjson not installed')
+    return app.json
+
+# -----------------------------
+# Test: dates and decimals use ISO 8601 / strings on both paths
+# -----------------------------
+def test_dates_and_decimals(provider):
+    payload = {'when': MOMENT, 'day': date(2025, 3, 1), 'amount': Decimal('1.50'), 'none': None}
+    assert json.loads(provider.dumps(payload)) == {
+        'when': MOMENT.isoformat(),
+        'day': '2025-03-01',
+        'amount': '1.50',
+        'none': None,
+    }
+
+# -----------------------------
+# Test: ORM rows serialize their columns, minus hidden ones
+# -----------------------------
+def test_model_rows(provider):
+    user = User.query.filter_by(email='student1@example.com').first()
+    data = json.loads(provider.dumps({'user': user}))['user']
+    assert data['id'] == user.id
+    assert data['email'] == 'student1@example.com'
+    assert 'password_hash' not in data
+
+    cls = Class(name='Serialized Class')
+    db.session.add(cls)
+    db.session.commit()
+    row = db.session.execute(db.select(Class.id, Class.name).filter_by(id=cls.id)).one()
+    assert json.loads(provider.dumps(row)) == {'id': cls.id, 'name': 'Serialized Class'}
+
+# -----------------------------
+# Test: key order and integer keys match the stdlib provider
+# -----------------------------
+def test_sorted_keys_and_non_string_keys(provider):
+    assert list(json.loads(provider.dumps({'b': 1, 'a': 2}))) == ['a', 'b']
+    assert json.loads(provider.dumps({1: 'one'})) == {'1': 'one'}
+    # Integers beyond 64 bits fall back to the stdlib encoder
+    assert json.loads(provider.dumps({'big': 2 ** 70})) == {'big': 2 ** 70}
+
+# -----------------------------
+# Test: jsonify responses go through the provider
+# -----------------------------
+def test_jsonify_response(provider, app):
+    response = provider.response({'when': MOMENT, 'items': [1, 2]})
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {'when': MOMENT.isoformat(), 'items': [1, 2]}
+    assert provider.loads(b'{"a": [1, 2]}') == {'a': [1, 2]}
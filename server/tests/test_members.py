@@ -22,3 +22,37 @@ def test_member_crud(client, app):
     if owner not in cohort.students:
         owner.cohort_id = cohort.id
         db.session.commit()
+
+def test_respond_invitation_email_pages(client):
+    # Unknown project/user renders the precompiled "not found" page
+    res = client.get('/members/projects/999999/respond-email/999999/accept')
+    assert res.status_code == 404
+    assert b'Invitation Not Found' in res.data
+
+    res = client.get('/members/projects/1/respond-email/1/maybe')
+    assert res.status_code == 400
+
+def test_email_templates_escape_context():
+    from app.utils.templates import render
+
+    html = render('emails/invitation.html', project_name='<script>x</script>', inviter_name='Admin User')
+    assert '&lt;script&gt;' in html
+    assert '<script>x' not in html
+    assert 'Admin User' in html
+
+def test_project_member_pair_is_unique(app):
+    from sqlalchemy.exc import IntegrityError
+    from app.models import ProjectMember
+
+    owner = User.query.filter_by(email='student1@example.com').first()
+    invitee = User.query.filter_by(email='student2@example.com').first()
+    project = Project(name='Unique Members', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+
+    db.session.add(ProjectMember(project_id=project.id, user_id=invitee.id, status='pending'))
+    db.session.commit()
+    db.session.add(ProjectMember(project_id=project.id, user_id=invitee.id, status='pending'))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
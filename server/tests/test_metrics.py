@@ -0,0 +1,153 @@
+# tests/test_metrics.py
+import json
+import os
+import subprocess
+import sys
+import logging
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.utils.pool_metrics import InstrumentedQueuePool, pool_stats, pool_snapshot
+
+def get_token(client, email, password):
+    login = client.post('/auth/login', json={'email': email, 'password': password})
+    assert login.status_code == 200
+    return login.json['token']
+
+# -----------------------------
+# Test: pool metrics endpoint (Admin only)
+# -----------------------------
+def test_pool_metrics_endpoint(client):
+    token = get_token(client, 'admin@test.com', 'adminpass')
+    res = client.get('/metrics/pool', headers={'Authorization': f'Bearer {token}'})
+    assert res.status_code == 200
+    data = res.json
+    for key in ('pid', 'pool_class', 'checkedout', 'overflow', 'connects', 'checkouts', 'invalidations', 'timeouts'):
+        assert key in data
+    assert data['checkouts'] > 0
+    assert set(data['checkout_wait']) == {'count', 'sum_seconds', 'max_seconds', 'buckets'}
+
+    token = get_token(client, 'student1@example.com', 'studentpass')
+    res = client.get('/metrics/pool', headers={'Authorization': f'Bearer {token}'})
+    assert res.status_code == 403
+
+# -----------------------------
+# Test: checkout waits and timeouts are recorded
+# -----------------------------
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    pool_stats.reset()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+            snapshot = pool_snapshot(engine)
+            assert snapshot['pool_class'] == 'InstrumentedQueuePool'
+            assert snapshot['checkedout'] == 1
+            assert snapshot['size'] == 1
+        assert pool_stats.timeouts == 1
+        assert pool_stats.wait_count == 2
+        assert pool_stats.wait_max >= 0.05
+        buckets = pool_stats.histogram()
+        assert buckets['+Inf'] == 2
+        assert buckets['0.05'] == 1  # only the uncontended checkout
+    finally:
+        engine.dispose()
+
+# -----------------------------
+# Test: per-request query counts, headers and slow-request logs
+# -----------------------------
+def test_query_stats_headers_and_slow_request_log(client, app, caplog):
+    token = get_token(client, 'admin@test.com', 'adminpass')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    res = client.get('/classes/')
+    assert 'X-DB-Query-Count' not in res.headers  # off outside debug mode
+
+    app.config.update(QUERY_STATS_HEADERS='true', SLOW_REQUEST_QUERY_COUNT=0)
+    with caplog.at_level(logging.WARNING, logger='app.utils.query_stats'):
+        res = client.get('/classes/')
+    assert int(res.headers['X-DB-Query-Count']) >= 1
+    assert float(res.headers['X-DB-Time-Ms']) >= 0
+
+    logged = [json.loads(r.getMessage()) for r in caplog.records if r.name == 'app.utils.query_stats']
+    assert logged[-1]['event'] == 'slow_request'
+    assert logged[-1]['endpoint'] == 'class_bp.get_classes'
+    assert logged[-1]['queries'] == int(res.headers['X-DB-Query-Count'])
+    slowest = logged[-1]['slowest']
+    assert 0 < len(slowest) <= app.config['QUERY_STATS_TOP_N']
+    assert [q['ms'] for q in slowest] == sorted((q['ms'] for q in slowest), reverse=True)
+
+    res = client.get('/metrics/queries', headers=headers)
+    assert res.status_code == 200
+    by_endpoint = {row['endpoint']: row for row in res.json['endpoints']}
+    classes = by_endpoint['class_bp.get_classes']
+    assert classes['requests'] >= 2
+    assert classes['queries'] >= classes['requests']
+    assert classes['avg_queries'] == round(classes['queries'] / classes['requests'], 2)
+
+# -----------------------------
+# Test: Prometheus exposition
+# -----------------------------
+def test_prometheus_metrics(client, app):
+    client.get('/classes/')
+    res = client.get('/metrics')
+    assert res.status_code == 200
+    assert res.mimetype == 'text/plain'
+    body = res.get_data(as_text=True)
+    assert 'http_requests_total{blueprint="class_bp",endpoint="class_bp.get_classes",method="GET",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{blueprint="class_bp",endpoint="class_bp.get_classes"' in body
+    assert 'http_requests_in_progress' in body
+    assert 'email_queue_depth{status="pending"} 0.0' in body
+    assert 'activity_log_queue_depth' in body
+    assert 'db_pool_events_total{event="checkouts"}' in body
+
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+# -----------------------------
+# Test: samples from separate worker processes are aggregated
+# -----------------------------
+WORKER_SCRIPT = """
+import sys
+from run import create_app
+from app.models import db
+app = create_app()
+with app.app_context():
+    db.create_all()
+client = app.test_client()
+for _ in range(int(sys.argv[1])):
+    client.get('/health')
+if len(sys.argv) > 2:
+    sys.stdout.write(client.get('/metrics').get_data(as_text=True))
+"""
+
+def test_prometheus_multiprocess_aggregation(tmp_path):
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    metrics_dir = tmp_path / 'prometheus'
+    metrics_dir.mkdir()
+    env = {
+        **os.environ,
+        'PROMETHEUS_MULTIPROC_DIR': str(metrics_dir),
+        'DATABASE_URL': f"sqlite:///{tmp_path / 'workers.db'}",
+    }
+
+    def run_worker(*args):
+        result = subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT, *args],
+            cwd=server_dir, env=env, capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout
+
+    run_worker('2')
+    run_worker('3')
+    body = run_worker('1', 'scrape')
+
+    line = 'http_requests_total{blueprint="",endpoint="health",method="GET",status="200"} 6.0'
+    assert line in body
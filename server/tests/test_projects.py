@@ -1,5 +1,7 @@
 import pytest
-from app.models import User, Project, Cohort, db
+from datetime import datetime, timezone
+from sqlalchemy import event
+from app.models import User, Project, ProjectMember, Cohort, Class, Task, db
 
 # -----------------------------
 # Helper: Get JWT token for a user
@@ -97,3 +99,318 @@ def test_project_crud(client):
     # Verify deletion
     res = client.get(f'/projects/{project_id}', headers=headers)
     assert res.status_code == 404
+
+# -----------------------------
+# Helper: count SQL statements issued inside a block
+# -----------------------------
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(db.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self)
+
+def seed_projects(count, owner, cohort, project_class, members):
+    for i in range(count):
+        project = Project(
+            name=f'Listing {i}',
+            owner_id=owner.id,
+            class_id=project_class.id,
+            cohort_id=cohort.id
+        )
+        db.session.add(project)
+        db.session.flush()
+        for member in members:
+            db.session.add(ProjectMember(project_id=project.id, user_id=member.id, status='accepted'))
+    db.session.commit()
+
+# -----------------------------
+# Test: project listing runs a fixed number of queries
+# -----------------------------
+def test_list_projects_query_count_is_constant(client):
+    cohort = Cohort(name='Listing Cohort')
+    project_class = Class(name='Listing Class')
+    db.session.add_all([cohort, project_class])
+    db.session.commit()
+
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    members = db.session.execute(
+        db.select(User).filter(User.email.in_(['student2@example.com', 'student3@example.com']))
+    ).scalars().all()
+
+    token = get_auth_token(client, 'student1@example.com', 'studentpass')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def count_listing_queries():
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            res = client.get('/projects?per_page=100', headers=headers)
+        assert res.status_code == 200
+        return counter.count, res.json
+
+    # Warm the authenticated-user cache so both measurements see the same auth cost
+    client.get('/projects', headers=headers)
+
+    seed_projects(2, owner, cohort, project_class, members)
+    small_count, small_page = count_listing_queries()
+
+    seed_projects(20, owner, cohort, project_class, members)
+    large_count, large_page = count_listing_queries()
+
+    assert len(large_page['items']) == 22
+    assert large_count == small_count
+    # versions + page count + page query + members/users (+ auth lookup on a cache miss)
+    assert large_count <= 5
+
+    item = large_page['items'][0]
+    assert item['owner_name'] == owner.name
+    assert item['class']['name'] == 'Listing Class'
+    assert item['cohort']['name'] == 'Listing Cohort'
+    assert {m['email'] for m in item['members']} == {'student2@example.com', 'student3@example.com'}
+
+# -----------------------------
+# Test: conditional GET with ETag / If-None-Match
+# -----------------------------
+def test_list_projects_etag_revalidation(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    token = get_auth_token(client, 'student1@example.com', 'studentpass')
+    headers = {'Authorization': f'Bearer {token}'}
+    db.session.add(Project(name='Tagged', owner_id=owner.id))
+    db.session.commit()
+
+    first = client.get('/projects', headers=headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('W/')
+
+    # Unchanged data: 304 with no body and no listing queries
+    with QueryCounter() as counter:
+        cached = client.get('/projects', headers={**headers, 'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == etag
+    assert counter.count == 1
+
+    # A different URL gets a different validator
+    assert client.get('/projects?per_page=5', headers=headers).headers['ETag'] != etag
+
+    # Any write to a table the listing reads changes the ETag
+    project = db.session.execute(db.select(Project).filter_by(name='Tagged')).scalar_one()
+    project.status = 'completed'
+    db.session.commit()
+    changed = client.get('/projects', headers={**headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+    # Bulk statements bump versions too
+    etag = changed.headers['ETag']
+    db.session.execute(db.update(Project).values(status='active'))
+    db.session.commit()
+    assert client.get('/projects', headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+# -----------------------------
+# Test: unrelated writes keep project ETags valid
+# -----------------------------
+def test_get_project_etag_ignores_unrelated_writes(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    token = get_auth_token(client, 'student1@example.com', 'studentpass')
+    headers = {'Authorization': f'Bearer {token}'}
+    project = Project(name='Stable', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+
+    etag = client.get(f'/projects/{project.id}', headers=headers).headers['ETag']
+    client.post('/tasks/', json={'title': 'Unrelated', 'project_id': project.id})
+
+    res = client.get(f'/projects/{project.id}', headers={**headers, 'If-None-Match': etag})
+    assert res.status_code == 304
+    assert client.get('/projects/999999', headers={**headers, 'If-None-Match': etag}).status_code == 404
+
+# -----------------------------
+# Test: project search with filters, highlights and keyset paging
+# -----------------------------
+def test_search_projects(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    member = db.session.execute(db.select(User).filter_by(email='student2@example.com')).scalar_one()
+    cohort = Cohort(name='Search Cohort')
+    db.session.add(cohort)
+    db.session.flush()
+    for i in range(5):
+        db.session.add(Project(name=f'Robot arm {i}', description='Servo control firmware', owner_id=owner.id,
+                               cohort_id=cohort.id if i % 2 == 0 else None, status='In Progress'))
+    db.session.add(Project(name='Weather app', description='Forecasts for 100% of cities', owner_id=owner.id))
+    db.session.commit()
+    tagged = db.session.execute(db.select(Project).filter_by(name='Robot arm 4')).scalar_one()
+    db.session.add(ProjectMember(project_id=tagged.id, user_id=member.id, status='accepted'))
+    db.session.commit()
+
+    token = get_auth_token(client, 'student1@example.com', 'studentpass')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # Walk every page with the returned cursor
+    names, cursor = [], ''
+    while cursor is not None:
+        res = client.get(f'/projects/search?q=servo&per_page=2&cursor={cursor}', headers=headers)
+        assert res.status_code == 200
+        assert len(res.json['items']) <= 2
+        names += [item['name'] for item in res.json['items']]
+        cursor = res.json['next_cursor']
+    assert sorted(names) == [f'Robot arm {i}' for i in range(5)]
+
+    item = res.json['items'][0]
+    assert '<mark>' in item['highlights']['description']
+
+    res = client.get(f'/projects/search?q=robot&cohort_id={cohort.id}', headers=headers)
+    assert {item['name'] for item in res.json['items']} == {'Robot arm 0', 'Robot arm 2', 'Robot arm 4'}
+    res = client.get(f'/projects/search?q=robot&member_of={member.id}', headers=headers)
+    assert [item['name'] for item in res.json['items']] == ['Robot arm 4']
+
+    # LIKE wildcards in the query are matched literally
+    res = client.get('/projects/search?q=100%25', headers=headers)
+    assert [item['name'] for item in res.json['items']] == ['Weather app']
+
+    assert client.get('/projects/search', headers=headers).status_code == 400
+    assert client.get('/projects/search?q=robot&owner_id=abc', headers=headers).status_code == 400
+    assert client.get('/projects/search?q=robot&cursor=%%%', headers=headers).status_code == 400
+
+# -----------------------------
+# Test: list_projects filters and sort keys
+# -----------------------------
+def test_list_projects_filters_and_sorting(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    other = db.session.execute(db.select(User).filter_by(email='student2@example.com')).scalar_one()
+    cohort = Cohort(name='Filter Cohort')
+    project_class = Class(name='Filter Class')
+    db.session.add_all([cohort, project_class])
+    db.session.flush()
+    old = Project(name='Beta', owner_id=owner.id, cohort_id=cohort.id, status='Completed',
+                  created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    new = Project(name='Alpha', owner_id=other.id, class_id=project_class.id, status='In Progress',
+                  created_at=datetime(2025, 6, 1, tzinfo=timezone.utc))
+    db.session.add_all([old, new])
+    db.session.flush()
+    db.session.add(ProjectMember(project_id=new.id, user_id=owner.id, status='accepted'))
+    db.session.add(ProjectMember(project_id=old.id, user_id=other.id, status='pending'))
+    db.session.commit()
+
+    token = get_auth_token(client, 'student1@example.com', 'studentpass')
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def names(query):
+        res = client.get(f'/projects?per_page=100&{query}', headers=headers)
+        assert res.status_code == 200
+        return [item['name'] for item in res.json['items']]
+
+    assert names(f'cohort_id={cohort.id}') == ['Beta']
+    assert names(f'class_id={project_class.id}') == ['Alpha']
+    assert names(f'owner_id={owner.id}&status=Completed') == ['Beta']
+    assert names(f'member_of={owner.id}') == ['Alpha']
+    # Pending invitations do not count as membership
+    assert names(f'member_of={other.id}') == []
+    assert names('created_after=2025-01-01') == ['Alpha']
+    assert names(f'owner_id={owner.id}&member_of={owner.id}') == []
+
+    assert names('sort=-name&status=Completed') == ['Beta']
+    ordered = names('sort=-created_at')
+    assert ordered.index('Alpha') < ordered.index('Beta')
+    ordered = names('sort=name')
+    assert ordered.index('Alpha') < ordered.index('Beta')
+
+    for query in ('sort=password', 'owner_id=me', 'created_after=yesterday', 'cursor=&sort=name'):
+        assert client.get(f'/projects?{query}', headers=headers).status_code == 400
+
+# -----------------------------
+# Test: search highlights escape HTML in project text
+# -----------------------------
+def test_search_highlights_escape_html(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    db.session.add(Project(name='<img src=x onerror=alert(1)> alpha', description='<script>x()</script> alpha & co',
+                           owner_id=owner.id))
+    db.session.commit()
+    token = get_auth_token(client, 'student1@example.com', 'studentpass')
+
+    res = client.get('/projects/search?q=alpha', headers={'Authorization': f'Bearer {token}'})
+    assert res.status_code == 200
+    highlights = res.json['items'][0]['highlights']
+    assert highlights['name'] == '&lt;img src=x onerror=alert(1)&gt; <mark>alpha</mark>'
+    assert highlights['description'] == '&lt;script&gt;x()&lt;/script&gt; <mark>alpha</mark> &amp; co'
+    # The raw fields stay as stored
+    assert res.json['items'][0]['name'] == '<img src=x onerror=alert(1)> alpha'
+
+# -----------------------------
+# Test: version counters are bumped once, in name order, at commit time
+# -----------------------------
+def test_version_bumps_deferred_to_commit(app):
+    from app.utils.versions import get_versions
+
+    bumps = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE resource_versions'):
+            bumps.append(parameters)
+
+    before = get_versions(('projects', 'tasks'))
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        project = Project(name='Deferred')
+        db.session.add(project)
+        db.session.flush()
+        db.session.add(Task(title='Deferred task', project_id=project.id))
+        db.session.flush()
+        assert bumps == []
+        db.session.commit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert [params[-1] for params in bumps] == ['projects', 'tasks']
+    assert get_versions(('projects', 'tasks')) == (before[0] + 1, before[1] + 1)
+
+    # A rolled-back write bumps nothing
+    db.session.add(Project(name='Rolled back'))
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+    assert get_versions(('projects', 'tasks')) == (before[0] + 1, before[1] + 1)
+
+# -----------------------------
+# Test: project listing selects only the requested columns
+# -----------------------------
+def test_list_projects_sparse_fieldsets(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    db.session.add(Project(name='Sparse', description='Long text', owner_id=owner.id))
+    db.session.commit()
+    headers = {'Authorization': f"Bearer {get_auth_token(client, 'student1@example.com', 'studentpass')}"}
+
+    res = client.get('/projects', headers=headers)
+    assert set(res.json['items'][0]) == {
+        'id', 'name', 'description', 'owner_id', 'github_link', 'status',
+        'owner_name', 'members', 'class', 'cohort'
+    }
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        res = client.get('/projects?fields=id,name', headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert res.status_code == 200
+    item = res.json['items'][0]
+    assert set(item) == {'id', 'name', 'owner_name', 'members', 'class', 'cohort'}
+    assert item['name'] == 'Sparse' and item['owner_name'] == owner.name
+    # The page query itself; the total comes from a separate count(*)
+    page_query = next(s for s in statements if s.startswith('SELECT projects.'))
+    assert 'projects.description' not in page_query
+
+    res = client.get('/projects?fields=id,name&cursor=', headers=headers)
+    assert res.status_code == 200
+    assert client.get('/projects?fields=secret', headers=headers).status_code == 400
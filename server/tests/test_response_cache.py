@@ -0,0 +1,88 @@
+# tests/test_response_cache.py
+from sqlalchemy import event
+from app.models import db, Class, Cohort
+from app.utils.response_cache import response_cache
+
+def get_token(client, email, password):
+    login = client.post('/auth/login', json={'email': email, 'password': password})
+    assert login.status_code == 200
+    return login.json['token']
+
+def count_statements(client, url, **kwargs):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        res = client.get(url, **kwargs)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return res, statements
+
+# -----------------------------
+# Test: repeat reads are served from the cache
+# -----------------------------
+def test_get_classes_hits_cache_until_commit(client):
+    db.session.add(Class(name='Cached Class'))
+    db.session.commit()
+
+    first, _ = count_statements(client, '/classes/')
+    second, statements = count_statements(client, '/classes/')
+    assert second.json == first.json
+    assert not any('FROM classes' in s for s in statements)
+    assert response_cache.stats()['hits'] == 1
+
+    # A commit that writes classes evicts the entry
+    res = client.post('/classes/', json={'name': 'Fresh Class'})
+    assert res.status_code == 201
+    third, statements = count_statements(client, '/classes/')
+    assert any('FROM classes' in s for s in statements)
+    assert 'Fresh Class' in {c['name'] for c in third.json}
+
+# -----------------------------
+# Test: only entries tagged with a written table are evicted
+# -----------------------------
+def test_eviction_is_scoped_to_written_tables(client):
+    token = get_token(client, 'student1@example.com', 'studentpass')
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/classes/')
+    client.get('/cohorts/', headers=headers)
+    assert response_cache.stats()['entries'] == 2
+
+    db.session.add(Cohort(name='New Cohort'))
+    db.session.commit()
+    stats = response_cache.stats()
+    assert stats['entries'] == 1
+    assert 'cohorts' not in stats['tags']
+    assert 'New Cohort' in {c['name'] for c in client.get('/cohorts/', headers=headers).json['items']}
+
+    # Bulk statements are tracked as well
+    db.session.execute(db.update(Class).values(name=Class.name + ' (renamed)'))
+    db.session.commit()
+    assert all(c['name'].endswith('(renamed)') for c in client.get('/classes/').json)
+
+# -----------------------------
+# Test: a response built before a concurrent write is not stored
+# -----------------------------
+def test_stale_generation_is_not_stored():
+    generation = response_cache.generation(('classes',))
+    response_cache.evict_tables({'classes'})
+    assert response_cache.set('k', (b'[]', 200, 'application/json'), ('classes',), generation=generation) is False
+    assert response_cache.backend.get('k') is None
+
+    generation = response_cache.generation(('classes',))
+    assert response_cache.set('k', (b'[]', 200, 'application/json'), ('classes',), generation=generation) is True
+
+# -----------------------------
+# Test: cache stats endpoint (Admin only)
+# -----------------------------
+def test_cache_metrics_endpoint(client):
+    client.get('/classes/')
+    client.get('/classes/')
+    token = get_token(client, 'admin@test.com', 'adminpass')
+    res = client.get('/metrics/cache', headers={'Authorization': f'Bearer {token}'})
+    assert res.status_code == 200
+    assert res.json['hits'] >= 1
+    assert res.json['misses'] >= 1
+    assert res.json['tags']['classes'] >= 1
@@ -0,0 +1,130 @@
+# tests/test_summary_stats.py
+from app.models import db, User, Project, Task, Cohort, Class, ProjectStat, TaskStat
+from app.utils.summary_stats import rebuild_summary_tables, rebuild_stats_command
+
+def get_token(client, email, password):
+    login = client.post('/auth/login', json={'email': email, 'password': password})
+    assert login.status_code == 200
+    return login.json['token']
+
+def summary_rows():
+    projects = {
+        (s.cohort_id, s.class_id, s.status): s.count
+        for s in db.session.execute(db.select(ProjectStat).where(ProjectStat.count != 0)).scalars()
+    }
+    tasks = {
+        (s.project_id, s.status): s.count
+        for s in db.session.execute(db.select(TaskStat).where(TaskStat.count != 0)).scalars()
+    }
+    return projects, tasks
+
+def assert_matches_rebuild():
+    """Incrementally maintained rows equal a recount from scratch"""
+    maintained = summary_rows()
+    rebuild_summary_tables(db.session)
+    db.session.commit()
+    assert summary_rows() == maintained
+    return maintained
+
+# -----------------------------
+# Test: route writes keep the summary tables current
+# -----------------------------
+def test_summary_tables_follow_writes(client):
+    owner = db.session.execute(db.select(User).filter_by(email='student1@example.com')).scalar_one()
+    cohort = Cohort(name='Stats Cohort')
+    project_class = Class(name='Stats Class')
+    db.session.add_all([cohort, project_class])
+    db.session.commit()
+    headers = {'Authorization': f"Bearer {get_token(client, 'student1@example.com', 'studentpass')}"}
+
+    res = client.post('/projects', json={'name': 'Counted', 'class_id': project_class.id, 'cohort_id': cohort.id},
+                      headers=headers)
+    assert res.status_code == 201
+    project_id = res.json['id']
+    db.session.add(Project(name='Loose', owner_id=owner.id))
+    db.session.commit()
+
+    task_ids = [
+        client.post('/tasks/', json={'title': f'Task {i}', 'project_id': project_id}).json['task_id']
+        for i in range(3)
+    ]
+    assert client.put(f'/tasks/{task_ids[0]}', json={'status': 'Done'}).status_code == 200
+    assert client.delete(f'/tasks/{task_ids[1]}').status_code == 200
+    assert client.patch(f'/projects/{project_id}/status', json={'status': 'Completed'},
+                        headers=headers).status_code == 200
+
+    projects, tasks = assert_matches_rebuild()
+    assert projects[(cohort.id, project_class.id, 'Completed')] == 1
+    assert projects[(0, 0, 'In Progress')] == 1
+    assert tasks == {(project_id, 'Done'): 1, (project_id, 'To Do'): 1}
+
+    # Deleting the project cascades to its tasks and drops their rows
+    assert client.delete(f'/projects/{project_id}', headers=headers).status_code == 200
+    projects, tasks = assert_matches_rebuild()
+    assert (cohort.id, project_class.id, 'Completed') not in projects
+    assert tasks == {}
+
+# -----------------------------
+# Test: moving a project between buckets, including after a commit expired it
+# -----------------------------
+def test_summary_tables_track_reassignment(app):
+    cohort = Cohort(name='Moving Cohort')
+    db.session.add(cohort)
+    project = Project(name='Mover', status='In Progress')
+    db.session.add(project)
+    db.session.commit()
+
+    project.cohort_id = cohort.id
+    project.status = 'Under Review'
+    db.session.commit()
+    projects, _ = assert_matches_rebuild()
+    assert projects == {(cohort.id, 0, 'Under Review'): 1}
+
+    # Deleting the cohort nulls cohort_id through the ORM relationship
+    db.session.delete(cohort)
+    db.session.commit()
+    projects, _ = assert_matches_rebuild()
+    assert projects == {(0, 0, 'Under Review'): 1}
+
+# -----------------------------
+# Test: rebuild command repairs drift from bulk statements
+# -----------------------------
+def test_rebuild_command_repairs_drift(app):
+    db.session.add_all([Project(name='A'), Project(name='B')])
+    db.session.commit()
+    db.session.execute(db.update(Project).values(status='Completed'))
+    db.session.commit()
+    assert summary_rows()[0] == {(0, 0, 'In Progress'): 2}
+
+    result = app.test_cli_runner().invoke(rebuild_stats_command)
+    assert result.exit_code == 0
+    assert '2 projects' in result.output
+    db.session.expire_all()
+    assert summary_rows()[0] == {(0, 0, 'Completed'): 2}
+
+# -----------------------------
+# Test: stats endpoint (Admin only)
+# -----------------------------
+def test_stats_endpoint(client):
+    cohort = Cohort(name='Dashboard Cohort')
+    db.session.add(cohort)
+    db.session.flush()
+    project = Project(name='Dashboard', cohort_id=cohort.id)
+    db.session.add(project)
+    db.session.flush()
+    db.session.add_all([Task(title='a', project_id=project.id), Task(title='b', project_id=project.id, status='Done')])
+    db.session.commit()
+
+    student = {'Authorization': f"Bearer {get_token(client, 'student1@example.com', 'studentpass')}"}
+    assert client.get('/stats', headers=student).status_code == 403
+
+    admin = {'Authorization': f"Bearer {get_token(client, 'admin@test.com', 'adminpass')}"}
+    res = client.get('/stats', headers=admin)
+    assert res.status_code == 200
+    assert res.json['projects']['total'] == 1
+    assert res.json['projects']['by_status'] == {'In Progress': 1}
+    assert res.json['projects']['by_cohort'][0]['cohort_name'] == 'Dashboard Cohort'
+    assert res.json['projects']['by_class'][0]['class_id'] is None
+    assert res.json['tasks']['by_status'] == {'To Do': 1, 'Done': 1}
+    assert res.json['tasks']['by_project'][0]['project_name'] == 'Dashboard'
+    assert res.json['tasks']['by_project'][0]['count'] == 2
@@ -1,6 +1,7 @@
 # tests/test_tasks.py
 import pytest
 from app.models import db, Task, Project, User
+from sqlalchemy import event
 from datetime import datetime
 import json
 
@@ -81,3 +82,107 @@ def test_get_tasks_by_project(client, seeded_project):
     assert resp.status_code == 200
     data = resp.get_json()
     assert all("assignee_id" in t for t in data)
+
+def test_get_tasks_streaming_filters_and_pages(client, seeded_project):
+    project_id = seeded_project["project_id"]
+    for i in range(5):
+        db.session.add(Task(title=f"Streamed {i}", project_id=project_id, status="Done" if i % 2 else "To Do"))
+    db.session.commit()
+
+    resp = client.get(f"/tasks/?project_id={project_id}")
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert len(resp.get_json()) == 6
+
+    resp = client.get(f"/tasks/?project_id={project_id}&status=Done")
+    assert [t["title"] for t in resp.get_json()] == ["Streamed 1", "Streamed 3"]
+
+    resp = client.get(f"/tasks/?project_id={project_id}&page=2&per_page=4")
+    assert [t["title"] for t in resp.get_json()] == ["Streamed 3", "Streamed 4"]
+
+    resp = client.get(f"/tasks/?project_id={project_id}&format=ndjson")
+    assert resp.mimetype == "application/x-ndjson"
+    lines = resp.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["title"] for line in lines][0] == "Initial Task"
+    assert len(lines) == 6
+
+    resp = client.get("/tasks/?project_id=abc")
+    assert resp.status_code == 400
+
+def test_get_tasks_sparse_fieldsets(client, seeded_project, app):
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        resp = client.get("/tasks/?fields=id,title")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert resp.get_json() == [{"id": seeded_project["task_id"], "title": "Initial Task"}]
+    task_query = [s for s in statements if "FROM tasks" in s][0]
+    assert "description" not in task_query
+
+    full = client.get("/tasks/").get_json()[0]
+    assert set(full) == {"id", "title", "description", "status", "project_id", "assignee_id", "created_at"}
+
+    resp = client.get("/tasks/?fields=id,secret")
+    assert resp.status_code == 400
+    assert "secret" in resp.get_json()["error"]
+
+def test_get_tasks_stream_empty(client):
+    resp = client.get("/tasks/?project_id=999999")
+    assert resp.status_code == 200
+    assert resp.get_json() == []
+
+def test_project_board_counts_and_assignees(client, seeded_project):
+
+    project_id = seeded_project["project_id"]
+    student_id = seeded_project["student_id"]
+    for i in range(20):
+        db.session.add(Task(
+            title=f"Board {i}",
+            project_id=project_id,
+            assignee_id=student_id,
+            status=["To Do", "In Progress", "Done"][i % 3]
+        ))
+    db.session.commit()
+    db.session.expire_all()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get(f"/tasks/project/{project_id}/board")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    # ETag versions + project lookup + tasks joined with assignees + GROUP BY counts
+    assert len(statements) == 4
+    assert data["total"] == 21
+    assert data["counts"] == {"To Do": 8, "In Progress": 7, "Done": 6}
+    assert all(t["assignee"]["id"] == student_id for t in data["tasks"])
+
+    resp = client.get("/tasks/project/999999/board")
+    assert resp.status_code == 404
+
+def test_project_board_counts_null_status(client, seeded_project, monkeypatch):
+    from app.utils import json_provider
+    # The stdlib encoder sorts keys, so a None key next to str keys would raise
+    monkeypatch.setattr(json_provider, "orjson", None)
+    project_id = seeded_project["project_id"]
+    task_id = seeded_project["task_id"]
+
+    resp = client.put(f"/tasks/{task_id}", json={"status": None})
+    assert resp.status_code == 200
+    db.session.add(Task(title="Done task", project_id=project_id, status="Done"))
+    db.session.commit()
+
+    resp = client.get(f"/tasks/project/{project_id}/board")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["counts"] == {"": 1, "Done": 1}
+    assert data["total"] == 2
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 from app.models import User, db
 
 # -----------------------------
@@ -95,3 +96,187 @@ def test_non_admin_list_users_denied(client):
     res = client.get('/users/', headers=headers)
     assert res.status_code == 403
     assert 'not authorized' in res.json['message'].lower()
+
+# -----------------------------
+# Test: list users selects only the requested columns
+# -----------------------------
+def test_list_users_sparse_fieldsets(client):
+    token = get_token(client, "admin@test.com", "adminpass")
+    headers = {'Authorization': f'Bearer {token}'}
+
+    # Default fields; this also warms the authenticated-user cache
+    res = client.get('/users/', headers=headers)
+    assert set(res.json[0]) == {'id', 'name', 'email', 'role'}
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        res = client.get('/users/?fields=id,email', headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert res.status_code == 200
+    assert all(set(u) == {'id', 'email'} for u in res.json)
+    assert 'admin@test.com' in {u['email'] for u in res.json}
+    assert not any('password_hash' in s for s in statements)
+
+    res = client.get('/users/?fields=password_hash', headers=headers)
+    assert res.status_code == 400
+
+# -----------------------------
+# Test: token_required caches the principal and role changes invalidate it
+# -----------------------------
+def test_principal_cache_invalidated_on_role_change(client):
+    from app.utils.auth import principal_cache
+
+    admin_headers = {'Authorization': f'Bearer {get_token(client, "admin@test.com", "adminpass")}'}
+    student = db.session.execute(
+        db.select(User).filter_by(email='student2@example.com')
+    ).scalar_one()
+    student_headers = {'Authorization': f'Bearer {get_token(client, "student2@example.com", "studentpass")}'}
+
+    res = client.get('/users/', headers=student_headers)
+    assert res.status_code == 403
+    assert principal_cache.get(student.id).role == 'Student'
+
+    # Promote the student; the cached principal must not keep the old role
+    res = client.put(f'/users/{student.id}', json={'role': 'Admin'}, headers=admin_headers)
+    assert res.status_code == 200
+    assert principal_cache.get(student.id) is None
+
+    res = client.get('/users/', headers=student_headers)
+    assert res.status_code == 200
+    assert principal_cache.get(student.id).role == 'Admin'
+
+    # Deleted users lose access immediately
+    res = client.delete(f'/users/{student.id}', headers=admin_headers)
+    assert res.status_code == 200
+    res = client.get('/users/', headers=student_headers)
+    assert res.status_code == 401
+
+# -----------------------------
+# Test: Admin bulk import with per-row report
+# -----------------------------
+def test_bulk_import_users(client, app):
+    admin_headers = {'Authorization': f'Bearer {get_token(client, "admin@test.com", "adminpass")}'}
+    app.config['USER_IMPORT_PROCESSES'] = 2
+
+    csv_body = (
+        "name,email,password,role\n"
+        "Import One,import1@test.com,pass1,Student\n"
+        "Import Two,import2@test.com,pass2,\n"
+        "Dup In File,import1@test.com,pass3,Student\n"
+        "Existing,student1@example.com,pass4,Student\n"
+        "No Password,import3@test.com,,Student\n"
+    )
+    res = client.post('/users/import', data=csv_body, content_type='text/csv', headers=admin_headers)
+    assert res.status_code == 200
+    assert res.json['created'] == 2
+    assert res.json['failed'] == 3
+    statuses = [(r['row'], r['status']) for r in res.json['results']]
+    assert statuses == [(1, 'created'), (2, 'created'), (3, 'error'), (4, 'error'), (5, 'error')]
+    assert res.json['results'][3]['error'] == 'Email already registered'
+
+    # Imported users can log in
+    assert get_token(client, 'import2@test.com', 'pass2')
+
+    ndjson_body = '{"name": "Import Four", "email": "import4@test.com", "password": "pass"}\n'
+    res = client.post('/users/import', data=ndjson_body, content_type='application/x-ndjson', headers=admin_headers)
+    assert res.status_code == 200
+    assert res.json['results'][0]['status'] == 'created'
+
+    res = client.post('/users/import', data='not json\n', content_type='application/x-ndjson', headers=admin_headers)
+    assert res.status_code == 400
+
+# -----------------------------
+# Test: bulk import normalizes emails and rejects bad rows without a 500
+# -----------------------------
+def test_bulk_import_rejects_bad_rows(client):
+    from app.utils.user_import import import_users
+
+    admin_headers = {'Authorization': f'Bearer {get_token(client, "admin@test.com", "adminpass")}'}
+    body = '\n'.join([
+        '{"name": "Mixed Case", "email": "Mixed.Case@Test.com", "password": "pass"}',
+        '{"name": "Same Lower", "email": "mixed.case@test.com", "password": "pass"}',
+        '{"name": "Existing", "email": "STUDENT1@example.com", "password": "pass"}',
+        '{"name": "Numeric Email", "email": 12345, "password": "pass"}',
+        '{"name": "Bad Role", "email": "badrole@test.com", "password": "pass", "role": "Superuser"}',
+        '{"name": "Lower Role", "email": "lowerrole@test.com", "password": "pass", "role": "admin"}',
+    ]) + '\n'
+    res = client.post('/users/import', data=body, content_type='application/x-ndjson', headers=admin_headers)
+    assert res.status_code == 200
+    results = res.json['results']
+    assert [r['status'] for r in results] == ['created', 'error', 'error', 'error', 'error', 'created']
+    assert results[0]['email'] == 'mixed.case@test.com'
+    assert results[1]['error'] == 'Duplicate email in upload'
+    assert results[2]['error'] == 'Email already registered'
+    assert results[3]['email'] == '12345'
+    assert results[3]['error'] == 'Invalid email address'
+    assert results[4]['error'].startswith('Invalid role')
+    assert User.query.filter_by(email='lowerrole@test.com').one().role == 'Admin'
+
+    # Rows that are not objects are reported, not raised
+    results = import_users(['not an object', None])
+    assert [r['status'] for r in results] == ['error', 'error']
+
+# -----------------------------
+# Test: a failed import does not echo the statement parameters
+# -----------------------------
+def test_bulk_import_database_error_is_not_echoed(client, monkeypatch):
+    from sqlalchemy.exc import DataError
+    from app.routes import user_routes
+
+    def failing_import(rows, processes=1):
+        raise DataError('INSERT INTO users ...', [{'password_hash': 'scrypt:32768:8:1$salt$secret'}], Exception('too long'))
+    monkeypatch.setattr(user_routes, 'import_users', failing_import)
+
+    admin_headers = {'Authorization': f'Bearer {get_token(client, "admin@test.com", "adminpass")}'}
+    body = '{"name": "Row", "email": "row@test.com", "password": "pass"}\n'
+    res = client.post('/users/import', data=body, content_type='application/x-ndjson', headers=admin_headers)
+    assert res.status_code == 500
+    assert res.json == {'message': 'Failed to import users'}
+    assert 'secret' not in res.get_data(as_text=True)
+
+# -----------------------------
+# Test: over-long and malformed values and insert conflicts fail only their row
+# -----------------------------
+def test_bulk_import_reports_row_level_failures(client, monkeypatch):
+    from app.utils import user_import
+
+    admin_headers = {'Authorization': f'Bearer {get_token(client, "admin@test.com", "adminpass")}'}
+    body = (
+        "name,email,password\n"
+        f"{'N' * 151},long.name@test.com,pass\n"
+        f"Long Email,{'e' * 150}@test.com,pass\n"
+        "No At,not-an-email,pass\n"
+        "Valid,valid.row@test.com,pass\n"
+    )
+    res = client.post('/users/import', data=body, content_type='text/csv', headers=admin_headers)
+    assert res.status_code == 200
+    results = res.json['results']
+    assert [r['status'] for r in results] == ['error', 'error', 'error', 'created']
+    assert results[0]['error'] == 'Name is longer than 150 characters'
+    assert results[1]['error'] == 'Email is longer than 150 characters'
+    assert results[2]['error'] == 'Invalid email address'
+
+    # A row registered concurrently, after the duplicate check, is skipped by the INSERT
+    real_insert = user_import._insert_users
+    def racing_insert(chunk):
+        db.session.add(User(name='Racer', email='race@test.com', password_hash='x'))
+        db.session.flush()
+        return real_insert(chunk)
+    monkeypatch.setattr(user_import, '_insert_users', racing_insert)
+
+    body = '\n'.join([
+        '{"name": "Race", "email": "race@test.com", "password": "pass"}',
+        '{"name": "Calm", "email": "calm@test.com", "password": "pass"}',
+    ]) + '\n'
+    res = client.post('/users/import', data=body, content_type='application/x-ndjson', headers=admin_headers)
+    assert res.status_code == 200
+    results = res.json['results']
+    assert [r['status'] for r in results] == ['error', 'created']
+    assert results[0]['error'] == 'Email already registered'
+    assert User.query.filter_by(email='race@test.com').one().name == 'Racer'